@@ -0,0 +1,314 @@
+import os
+import zlib
+from contextlib import contextmanager
+from flask import current_app
+from sqlalchemy import Integer, MetaData, inspect, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex, CreateTable
+from app.extensions import database
+from app.models.models.meta import AppMeta
+from app.models.models.order import ServiceOrder, legacy_status_code_sql
+from app.models.models.rollup import OrderDailyRollup
+from app.rollup import rebuild_rollup
+from app.search import service_search
+from app.seed import seed_database
+
+try:
+    import fcntl
+except ImportError:  # Windows: lock file tidak tersedia, cukup untuk development
+    fcntl = None
+
+# Naikkan setiap kali ada perubahan skema/data yang perlu diterapkan saat bootstrap
+SCHEMA_REVISION = 12
+SCHEMA_REVISION_KEY = 'schema_revision'
+# Dicatat terpisah dari revisi: seed yang gagal diulang tanpa menjalankan ulang migrasi
+SEEDED_KEY = 'seeded'
+
+# Key advisory lock yang sama untuk semua worker (Postgres butuh bigint)
+BOOTSTRAP_LOCK_NAME = 'miya_laundry_bootstrap'
+BOOTSTRAP_LOCK_KEY = zlib.crc32(BOOTSTRAP_LOCK_NAME.encode())
+
+
+def bootstrap_state():
+    """
+    Membaca (revisi skema, sudah di-seed) yang tercatat di database dalam satu query.
+    Mengembalikan (0, False) jika tabel app_meta belum ada.
+    """
+    try:
+        values = dict(database.session.execute(
+            select(AppMeta.key, AppMeta.value).where(AppMeta.key.in_((SCHEMA_REVISION_KEY, SEEDED_KEY)))
+        ).all())
+    except (OperationalError, ProgrammingError):
+        database.session.rollback()
+        return 0, False
+    revision = values.get(SCHEMA_REVISION_KEY)
+    return (int(revision) if revision else 0), SEEDED_KEY in values
+
+
+def _is_ready(app, state):
+    revision, seeded = state
+    return revision >= SCHEMA_REVISION and (seeded or not app.config['SEED_ON_STARTUP'])
+
+
+def is_bootstrapped(app=None):
+    """Cek murah (satu query) apakah skema dan data awal sudah siap."""
+    return _is_ready(app or current_app, bootstrap_state())
+
+
+@contextmanager
+def _sqlite_lock(engine):
+    database_path = engine.url.database
+    if fcntl is None or not database_path or database_path == ':memory:':
+        yield
+        return
+
+    with open(f'{database_path}.bootstrap.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+@contextmanager
+def _postgresql_lock(engine):
+    with engine.connect() as connection:
+        connection.execute(text('SELECT pg_advisory_lock(:key)'), {'key': BOOTSTRAP_LOCK_KEY})
+        try:
+            yield
+        finally:
+            connection.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': BOOTSTRAP_LOCK_KEY})
+            connection.commit()
+
+
+@contextmanager
+def _mysql_lock(engine):
+    with engine.connect() as connection:
+        connection.execute(text('SELECT GET_LOCK(:name, -1)'), {'name': BOOTSTRAP_LOCK_NAME})
+        try:
+            yield
+        finally:
+            connection.execute(text('SELECT RELEASE_LOCK(:name)'), {'name': BOOTSTRAP_LOCK_NAME})
+
+
+@contextmanager
+def bootstrap_lock(engine):
+    """
+    Lock lintas proses agar hanya satu worker yang menjalankan DDL dan seeding.
+    SQLite memakai lock file, Postgres/MySQL memakai advisory lock.
+    """
+    lock_factories = {
+        'sqlite': _sqlite_lock,
+        'postgresql': _postgresql_lock,
+        'mysql': _mysql_lock,
+    }
+    lock_factory = lock_factories.get(engine.dialect.name)
+    if lock_factory is None:
+        yield
+        return
+
+    with lock_factory(engine):
+        yield
+
+
+def ensure_indexes():
+    """
+    create_all() tidak menambahkan index baru ke tabel yang sudah ada,
+    jadi setiap index di metadata dibuat di sini jika belum ada.
+    """
+    with database.engine.begin() as connection:
+        if connection.dialect.name == 'mysql':
+            # MySQL tidak mendukung CREATE INDEX IF NOT EXISTS
+            inspector = inspect(connection)
+            for table in database.metadata.sorted_tables:
+                existing = {index['name'] for index in inspector.get_indexes(table.name)}
+                for index in table.indexes:
+                    if index.name not in existing:
+                        index.create(bind=connection)
+            return
+
+        # IF NOT EXISTS juga berlaku untuk index ekspresi yang tidak bisa direfleksi SQLAlchemy
+        for table in database.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(CreateIndex(index, if_not_exists=True))
+
+
+def analyze_tables():
+    """
+    Memperbarui statistik planner setelah index baru dibuat, agar SQLite/Postgres
+    memilih partial index antrian pesanan alih-alih sort sementara.
+    """
+    with database.engine.begin() as connection:
+        if connection.dialect.name == 'mysql':
+            connection.execute(text('ANALYZE TABLE service_orders'))
+        else:
+            connection.execute(text('ANALYZE'))
+
+
+# Kolom uang (rupiah) dan jumlah yang dulu Numeric, sekarang integer
+INTEGER_MONEY_COLUMNS = (
+    ('laundry_services', 'price', 'INTEGER'),
+    ('service_orders', 'quantity', 'INTEGER'),
+    ('service_orders', 'total_price', 'INTEGER'),
+    ('order_daily_rollups', 'quantity', 'BIGINT'),
+    ('order_daily_rollups', 'revenue', 'BIGINT'),
+)
+
+
+def convert_money_to_integer():
+    """
+    Membulatkan nilai uang lama ke rupiah penuh dan mengubah tipe kolomnya.
+    SQLite tidak bisa ALTER COLUMN, tetapi kolom NUMERIC menyimpan nilai bulat
+    sebagai INTEGER, jadi cukup membulatkan datanya.
+    """
+    with database.engine.begin() as connection:
+        dialect = connection.dialect.name
+        for table, column, sql_type in INTEGER_MONEY_COLUMNS:
+            if dialect == 'postgresql':
+                connection.execute(text(
+                    f'ALTER TABLE {table} ALTER COLUMN {column} TYPE {sql_type} USING round({column})::{sql_type}'
+                ))
+            elif dialect == 'mysql':
+                connection.execute(text(f'UPDATE {table} SET {column} = ROUND({column})'))
+                connection.execute(text(f'ALTER TABLE {table} MODIFY COLUMN {column} {sql_type} NOT NULL'))
+            else:
+                connection.execute(text(
+                    f'UPDATE {table} SET {column} = CAST(ROUND({column}) AS INTEGER) WHERE {column} IS NOT NULL'
+                ))
+
+
+def _rebuild_sqlite_orders_table(connection):
+    """
+    SQLite tidak bisa ALTER COLUMN: tabel baru dibuat dari definisi model, data disalin
+    dengan status yang sudah dikonversi, lalu tabel lama diganti. Index dibuat ulang
+    oleh ensure_indexes() yang berjalan setelah migrasi skema.
+    """
+    table = ServiceOrder.__table__
+    metadata = MetaData()
+    # Tabel yang dirujuk foreign key harus ada di metadata salinan
+    for foreign_key in table.foreign_keys:
+        foreign_key.column.table.to_metadata(metadata)
+    new_table = table.to_metadata(metadata, name=f'{table.name}_new')
+    columns = [column.name for column in table.columns]
+    select_columns = [legacy_status_code_sql('status') if name == 'status' else name for name in columns]
+
+    connection.execute(text(f'DROP TABLE IF EXISTS {new_table.name}'))
+    connection.execute(CreateTable(new_table))
+    connection.execute(text(
+        f"INSERT INTO {new_table.name} ({', '.join(columns)}) "
+        f"SELECT {', '.join(select_columns)} FROM {table.name}"
+    ))
+    connection.execute(text(f'DROP TABLE {table.name}'))
+    connection.execute(text(f'ALTER TABLE {new_table.name} RENAME TO {table.name}'))
+
+
+def convert_status_to_code():
+    """
+    Menormalkan status pesanan lama ('Pending', ' ready ', NULL, ...) dan menyimpannya
+    sebagai SMALLINT. Tabel rollup hanya berisi data turunan: dibuat ulang lalu
+    diisi kembali oleh rebuild_rollup().
+    """
+    rollup_table = OrderDailyRollup.__table__
+    with database.engine.begin() as connection:
+        dialect = connection.dialect.name
+        status_column = next(
+            column for column in inspect(connection).get_columns('service_orders') if column['name'] == 'status'
+        )
+        if isinstance(status_column['type'], Integer):
+            # Database baru: create_all() sudah membuat kolom SMALLINT
+            pass
+        elif dialect == 'postgresql':
+            # Predikat partial index lama masih memakai string
+            connection.execute(text('DROP INDEX IF EXISTS ix_service_orders_open_queue'))
+            connection.execute(text(
+                f"ALTER TABLE service_orders ALTER COLUMN status TYPE SMALLINT USING {legacy_status_code_sql('status')}"
+            ))
+            connection.execute(text('ALTER TABLE service_orders ALTER COLUMN status SET NOT NULL'))
+        elif dialect == 'mysql':
+            connection.execute(text(f"UPDATE service_orders SET status = {legacy_status_code_sql('status')}"))
+            connection.execute(text('ALTER TABLE service_orders MODIFY COLUMN status SMALLINT NOT NULL'))
+        else:
+            _rebuild_sqlite_orders_table(connection)
+
+        rollup_table.drop(connection, checkfirst=True)
+        rollup_table.create(connection)
+
+
+# Migrasi skema yang harus selesai sebelum ensure_indexes(): index di metadata memakai
+# tipe kolom terbaru (predikat partial index antrian membandingkan status dengan kode integer)
+SCHEMA_MIGRATIONS = [
+    (10, convert_status_to_code),
+]
+
+# Migrasi data yang dijalankan sekali saat revisi database masih di bawah angka tersebut.
+# Rollup (dan sejak revisi 11 total per status) hanya dihitung ulang sekali, setelah
+# status dan nilai uang pesanan sudah dalam format terbaru.
+MIGRATIONS = [
+    (5, analyze_tables),
+    (7, service_search.install),
+    (9, convert_money_to_integer),
+    # Statistik planner untuk index status yang sekarang berisi kode
+    (10, analyze_tables),
+    (11, rebuild_rollup),
+    # Index pencarian Postgres dibuat ulang dengan unaccent, sama seperti normalize() di query
+    (12, service_search.install),
+]
+
+
+def run_migrations(previous_revision, migrations=MIGRATIONS):
+    for revision, migration in migrations:
+        if previous_revision < revision:
+            migration()
+
+
+def _set_meta(key, value):
+    meta = database.session.get(AppMeta, key)
+    if meta is None:
+        database.session.add(AppMeta(key=key, value=str(value)))
+    else:
+        meta.value = str(value)
+    database.session.commit()
+
+
+def bootstrap_database(app=None):
+    """
+    Membuat tabel, menjalankan migrasi, dan mengisi data awal tepat satu kali.
+    Worker lain yang menunggu lock akan melihat revisi terbaru dan langsung lanjut melayani request.
+    Mengembalikan True jika proses ini yang menjalankan bootstrap.
+    """
+    app = app or current_app
+    if app.config['DATABASE_BOOTSTRAP'] == 'off':
+        return False
+
+    if is_bootstrapped(app):
+        return False
+
+    # Tutup transaksi baca sebelum menunggu lock agar tidak menahan lock SQLite
+    database.session.rollback()
+
+    with bootstrap_lock(database.engine):
+        # Cek ulang: worker lain mungkin sudah selesai saat kita menunggu lock
+        state = bootstrap_state()
+        if _is_ready(app, state):
+            return False
+        previous_revision, seeded = state
+
+        if previous_revision < SCHEMA_REVISION:
+            database.create_all()
+            run_migrations(previous_revision, SCHEMA_MIGRATIONS)
+            ensure_indexes()
+            run_migrations(previous_revision)
+            # Dicatat sebelum seeding: seed yang gagal tidak membuat migrasi diulang
+            _set_meta(SCHEMA_REVISION_KEY, SCHEMA_REVISION)
+            app.logger.info(f"Migrasi database selesai (revisi {SCHEMA_REVISION}, pid {os.getpid()})")
+
+        if app.config['SEED_ON_STARTUP'] and not seeded:
+            try:
+                result = seed_database()
+                _set_meta(SEEDED_KEY, 1)
+                app.logger.info(f"Seed data berhasil dibuat: {result}")
+            except Exception as e:
+                # Penanda seed tidak dicatat agar startup berikutnya mencoba lagi
+                app.logger.error(f"Error saat seeding data: {e}")
+
+    return True
@@ -0,0 +1,90 @@
+import threading
+from collections import namedtuple
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import select
+from app.extensions import database
+from app.models.models.service import LaundryService
+from app.replica import replica_routing
+from app.versioning import SharedVersion
+
+
+@dataclass(frozen=True)
+class CatalogItem:
+    """Salinan immutable satu layanan aktif untuk ditampilkan di halaman publik."""
+    id: int
+    name: str
+    description: str
+    price: int
+    unit: str
+    duration: Optional[str]
+    image_url: Optional[str]
+    is_active: bool
+    updated_at: Optional[datetime]
+
+    get_formatted_price = LaundryService.get_formatted_price
+
+
+CatalogSnapshot = namedtuple('CatalogSnapshot', ['version', 'items', 'last_modified'])
+
+
+class CatalogCache:
+    """
+    Cache katalog layanan aktif per proses.
+    Setiap perubahan dari admin menaikkan versi katalog bersama, sehingga
+    semua worker memuat ulang snapshot pada request berikutnya.
+    """
+
+    def __init__(self):
+        self.version = SharedVersion('catalog')
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.version.init_app(app)
+        self._snapshot = None
+
+    def snapshot(self):
+        """Snapshot katalog terbaru; query database hanya jika versi berubah."""
+        version = self.version.get()
+        snapshot = self._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or snapshot.version != version:
+                snapshot = self._load(version)
+                self._snapshot = snapshot
+        return snapshot
+
+    def active_services(self):
+        return self.snapshot().items
+
+    def bump(self):
+        """Dipanggil setelah create/edit/delete layanan di-commit."""
+        return self.version.bump()
+
+    def _load(self, version):
+        # Snapshot dipakai ulang dengan nomor versi terbaru, jadi tidak boleh dibaca dari replica yang tertinggal
+        with replica_routing.primary():
+            rows = database.session.execute(
+                select(
+                    LaundryService.id, LaundryService.name, LaundryService.description,
+                    LaundryService.price, LaundryService.unit, LaundryService.duration,
+                    LaundryService.image_url, LaundryService.is_active, LaundryService.updated_at
+                )
+                .where(LaundryService.is_active.is_(True))
+                .order_by(LaundryService.id)
+            ).all()
+        items = tuple(CatalogItem(*row) for row in rows)
+        # Waktu bump ikut dihitung: menonaktifkan/menghapus layanan tidak menaikkan updated_at
+        # layanan aktif, jadi tanpa itu Last-Modified bisa tetap atau mundur
+        timestamps = [item.updated_at for item in items if item.updated_at]
+        timestamps.append(self.version.modified())
+        last_modified = max((timestamp for timestamp in timestamps if timestamp), default=None)
+        return CatalogSnapshot(version, items, last_modified)
+
+
+catalog_cache = CatalogCache()
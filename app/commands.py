@@ -0,0 +1,153 @@
+import click
+from app.exports import (
+    CUSTOMER_EXPORT_COLUMNS, ORDER_EXPORT_COLUMNS,
+    customers_export_query, export_chunks, orders_export_query
+)
+from app.filters import OrderFilters
+from app.models.models.order import ORDER_STATUSES
+from app.outbox import outbox
+from app.rollup import rebuild_rollup, verify_rollup
+from app.search import service_search
+from app.seed import seed_database
+
+
+@click.command('seed')
+@click.option('--workers', type=int, default=None, help='Jumlah proses untuk hashing password.')
+def seed_command(workers):
+    """Mengisi data awal (roles, users, layanan) secara bulk."""
+    result = seed_database(workers=workers)
+    click.echo(
+        f"Seed selesai: {result['roles']} roles, {result['users']} users, "
+        f"{result['services']} layanan ditambahkan"
+    )
+
+
+@click.group('rollup')
+def rollup_group():
+    """Perawatan tabel rollup harian pesanan."""
+
+
+@rollup_group.command('rebuild')
+def rollup_rebuild_command():
+    """Menghitung ulang rollup dari service_orders lalu memverifikasinya."""
+    rows = rebuild_rollup()
+    click.echo(f"Rollup dibangun ulang: {rows} baris")
+    _report_rollup_mismatches(verify_rollup())
+
+
+@rollup_group.command('verify')
+def rollup_verify_command():
+    """Membandingkan rollup dengan agregasi langsung dari service_orders."""
+    _report_rollup_mismatches(verify_rollup())
+
+
+def _report_rollup_mismatches(mismatches):
+    if not mismatches:
+        click.echo("Rollup sesuai dengan service_orders")
+        return
+    for day, service_id, status in mismatches[:20]:
+        if service_id is None:
+            click.echo(f"   Tidak sesuai: {day} status {status}")
+        else:
+            click.echo(f"   Tidak sesuai: {day} layanan {service_id} status {status}")
+    raise click.ClickException(f"{len(mismatches)} baris rollup tidak sesuai")
+
+
+@click.group('search')
+def search_group():
+    """Perawatan index pencarian layanan."""
+
+
+@search_group.command('rebuild')
+def search_rebuild_command():
+    """Membuat (jika perlu) dan mengisi ulang index pencarian dari laundry_services."""
+    service_search.install()
+    click.echo(f"Index pencarian dibangun ulang (backend: {service_search.backend})")
+
+
+@click.group('outbox')
+def outbox_group():
+    """Dispatcher outbox efek samping pesanan."""
+
+
+@outbox_group.command('run')
+@click.option('--once', is_flag=True, help='Kirim pesan yang sudah jatuh tempo lalu berhenti.')
+def outbox_run_command(once):
+    """Menjalankan dispatcher outbox sebagai proses terpisah (worker)."""
+    if once:
+        click.echo(f"Outbox: {outbox.drain()} pesan diproses")
+        return
+    click.echo("Dispatcher outbox berjalan (Ctrl+C untuk berhenti)")
+    try:
+        outbox.run_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+@outbox_group.command('status')
+def outbox_status_command():
+    """Jumlah pesan outbox per status (pending, done, dead)."""
+    counts = outbox.counts()
+    for status in ('pending', 'done', 'dead'):
+        click.echo(f"{status}: {counts.get(status, 0)}")
+
+
+@click.group('export')
+def export_group():
+    """Export data ke CSV/NDJSON secara streaming (memori konstan)."""
+
+
+def _export_options(function):
+    function = click.option('--output', '-o', default='-', help='File tujuan (default: stdout).')(function)
+    function = click.option('--batch-size', type=int, default=None, help='Baris per batch cursor.')(function)
+    return click.option(
+        '--format', 'export_format', type=click.Choice(['csv', 'ndjson']), default='csv', show_default=True
+    )(function)
+
+
+def _write_export(output, chunks):
+    if output == '-':
+        for chunk in chunks:
+            click.echo(chunk, nl=False)
+        return
+    # newline='': baris CSV sudah diakhiri \r\n oleh modul csv
+    with open(output, 'w', encoding='utf-8', newline='') as export_file:
+        for chunk in chunks:
+            export_file.write(chunk)
+
+
+@export_group.command('orders')
+@_export_options
+@click.option('--status', multiple=True, type=click.Choice(ORDER_STATUSES), help='Boleh diulang.')
+@click.option('--date-from', type=click.DateTime(['%Y-%m-%d']), default=None)
+@click.option('--date-to', type=click.DateTime(['%Y-%m-%d']), default=None, help='Inklusif.')
+@click.option('--service-id', type=int, default=None)
+@click.option('--customer-id', type=int, default=None)
+def export_orders_command(export_format, batch_size, output, status, date_from, date_to, service_id, customer_id):
+    """Export pesanan dengan filter yang sama seperti halaman manajemen pesanan."""
+    filters = OrderFilters(
+        statuses=tuple(status),
+        date_from=date_from.date() if date_from else None,
+        date_to=date_to.date() if date_to else None,
+        service_id=service_id,
+        customer_id=customer_id,
+    )
+    _write_export(output, export_chunks(export_format, ORDER_EXPORT_COLUMNS, orders_export_query(filters), batch_size))
+
+
+@export_group.command('customers')
+@_export_options
+@click.option('--search', '-q', default='', help='Awalan username, nama, email, atau telepon.')
+def export_customers_command(export_format, batch_size, output, search):
+    """Export data pelanggan."""
+    query = customers_export_query(search.strip())
+    _write_export(output, export_chunks(export_format, CUSTOMER_EXPORT_COLUMNS, query, batch_size))
+
+
+def register_commands(app):
+    """Mendaftarkan semua perintah CLI `flask ...` ke aplikasi."""
+    app.cli.add_command(seed_command)
+    app.cli.add_command(rollup_group)
+    app.cli.add_command(export_group)
+    app.cli.add_command(search_group)
+    app.cli.add_command(outbox_group)
@@ -0,0 +1,147 @@
+import logging
+import os
+import threading
+import time
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Batas atas (detik) bucket histogram waktu tunggu checkout koneksi
+WAIT_BUCKETS = (0.001, 0.01, 0.1, 1.0, 5.0)
+
+# Thread latar per worker yang juga memakai koneksi: relay feed live dan dispatcher outbox
+BACKGROUND_CONNECTIONS = 2
+
+
+class PoolMetrics:
+    """
+    Statistik checkout pool koneksi per proses: berapa lama request menunggu koneksi,
+    berapa kali pool habis (semua koneksi + overflow terpakai) dan berapa yang timeout.
+    Dipakai untuk menentukan ukuran pool dan max_connections database dari data.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.exhausted = 0
+            self.timeouts = 0
+            self.total_wait = 0.0
+            self.max_wait = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS) + 1)
+            self.started_at = time.time()
+
+    def record(self, wait, exhausted, timed_out=False):
+        bucket = next((index for index, limit in enumerate(WAIT_BUCKETS) if wait < limit), len(WAIT_BUCKETS))
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+            self.buckets[bucket] += 1
+            if exhausted:
+                self.exhausted += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self):
+        with self._lock:
+            labels = [f'<{limit * 1000:g}ms' for limit in WAIT_BUCKETS] + [f'>={WAIT_BUCKETS[-1] * 1000:g}ms']
+            return {
+                'pid': os.getpid(),
+                'since': self.started_at,
+                'checkouts': self.checkouts,
+                'exhausted': self.exhausted,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.total_wait / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.max_wait * 1000, 3),
+                'wait_histogram': [[label, count] for label, count in zip(labels, self.buckets)],
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool yang mencatat waktu tunggu setiap checkout ke pool_metrics."""
+
+    def _do_get(self):
+        # Pool habis: semua koneksi dipinjam dan overflow sudah maksimum, checkout harus menunggu
+        exhausted = self._max_overflow > -1 and self.checkedout() >= self.size() + self._max_overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record(time.perf_counter() - started, exhausted, timed_out=True)
+            logger.warning(
+                f'Pool koneksi database habis: timeout {self._timeout}s '
+                f'(size {self.size()}, overflow {self._max_overflow})'
+            )
+            raise
+        pool_metrics.record(time.perf_counter() - started, exhausted)
+        return connection
+
+
+def pool_status(engine):
+    """Kondisi pool saat ini untuk engine aplikasi di proses ini."""
+    pool = engine.pool
+    status = {'class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+        )
+    return status
+
+
+def auto_pool_size(config):
+    """
+    (pool_size, max_overflow) per proses worker. Default: GUNICORN_THREADS koneksi per worker,
+    ditambah overflow untuk thread latar. Jika DATABASE_MAX_CONNECTIONS diisi, total
+    semua worker (WEB_CONCURRENCY) dijaga di bawah batas itu.
+    """
+    threads = config['GUNICORN_THREADS']
+    pool_size = config['DATABASE_POOL_SIZE'] or threads
+    max_overflow = config['DATABASE_MAX_OVERFLOW']
+    if max_overflow is None:
+        max_overflow = BACKGROUND_CONNECTIONS
+
+    max_connections = config['DATABASE_MAX_CONNECTIONS']
+    if max_connections:
+        per_worker = max(max_connections // max(config['WEB_CONCURRENCY'], 1), 1)
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+    return pool_size, max_overflow
+
+
+def engine_options(config):
+    """
+    SQLALCHEMY_ENGINE_OPTIONS dari konfigurasi DATABASE_POOL_*.
+    SQLite in-memory memakai StaticPool bawaan Flask-SQLAlchemy, jadi tidak diubah;
+    pre_ping dan recycle hanya untuk database server (Postgres/MySQL).
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    is_sqlite = url.get_backend_name() == 'sqlite'
+    if is_sqlite and url.database in (None, '', ':memory:'):
+        return {}
+
+    pool_size, max_overflow = auto_pool_size(config)
+    options = {
+        'poolclass': InstrumentedQueuePool,
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': config['DATABASE_POOL_TIMEOUT'],
+    }
+    if not is_sqlite:
+        # Koneksi yang diputus proxy/database saat idle dideteksi sebelum dipakai request
+        options['pool_pre_ping'] = config['DATABASE_POOL_PRE_PING']
+        options['pool_recycle'] = config['DATABASE_POOL_RECYCLE']
+    return options
@@ -0,0 +1,305 @@
+import json
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session
+from app.extensions import database
+from app.models.models.event import OrderEvent
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = 'order_created'
+STATUS_CHANGED = 'status_changed'
+
+# Penanda di session.info: transaksi ini menulis event, bangunkan relay setelah commit
+PENDING_EVENTS_KEY = 'order_events_pending'
+
+# Jumlah event maksimum per query relay / per replay Last-Event-ID
+EVENT_BATCH_SIZE = 500
+
+# Jumlah id kosong (celah) maksimum yang masih ditunggu relay
+EVENT_MAX_GAPS = 1000
+
+# Bagian kapasitas worker gunicorn (koneksi gevent / thread gthread) yang disisakan untuk
+# request biasa jika SSE_MAX_CLIENTS tidak diisi
+SSE_RESERVED_SHARE = 4
+
+# Dikirim ke subscriber yang antriannya penuh: stream ditutup dan klien replay dari Last-Event-ID
+OVERFLOW = object()
+
+
+def _event_dict(row):
+    return {
+        'id': row.id,
+        'type': row.event_type,
+        'order_id': row.order_id,
+        'status': row.status,
+        'created_at': row.created_at.isoformat(),
+    }
+
+
+def format_sse(event_data):
+    """Satu pesan text/event-stream; id dipakai browser untuk header Last-Event-ID saat reconnect."""
+    return f"id: {event_data['id']}\nevent: {event_data['type']}\ndata: {json.dumps(event_data)}\n\n"
+
+
+def max_sse_clients(config):
+    """
+    Batas koneksi SSE per worker, selalu di bawah kapasitas worker agar request biasa
+    tidak ikut antre di belakang browser yang membuka feed live. Di worker gevent stream
+    yang menganggur hanya satu greenlet, jadi kapasitasnya GUNICORN_WORKER_CONNECTIONS;
+    di worker gthread setiap stream menahan satu dari GUNICORN_THREADS thread.
+    """
+    if config['GUNICORN_WORKER_CLASS'] == 'gthread':
+        setting, capacity = 'GUNICORN_THREADS', config['GUNICORN_THREADS']
+    else:
+        setting, capacity = 'GUNICORN_WORKER_CONNECTIONS', config['GUNICORN_WORKER_CONNECTIONS']
+    limit = max(capacity - 1, 1)
+    max_clients = config['SSE_MAX_CLIENTS']
+    if max_clients is None:
+        return max(capacity - capacity // SSE_RESERVED_SHARE, 1)
+    if max_clients > limit:
+        logger.warning(f'SSE_MAX_CLIENTS={max_clients} melebihi {setting}={capacity}; dibatasi menjadi {limit}')
+        return limit
+    return max_clients
+
+
+class Subscription:
+    """
+    Antrian terbatas milik satu koneksi SSE, dengan posisi replay klien itu sendiri.
+    Event dengan id <= after_id sudah diterima klien (Last-Event-ID atau backlog);
+    event yang terlambat commit tetap diteruskan, dan setiap id hanya dikirim sekali.
+    """
+
+    def __init__(self, maxsize, after_id, delivered_ids=()):
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.overflowed = False
+        self.after_id = after_id
+        # Posisi replay susulan relay untuk klien ini; None jika sudah menyusul
+        self.position = after_id
+        self._delivered = set(delivered_ids)
+
+    def put(self, event_data, late=False):
+        event_id = event_data['id']
+        if event_id in self._delivered or (event_id <= self.after_id and not late):
+            return
+        self._delivered.add(event_id)
+        try:
+            self.queue.put_nowait(event_data)
+        except queue.Full:
+            # Klien terlalu lambat: jangan menahan relay, putuskan saja
+            self.overflowed = True
+
+    def get(self, timeout):
+        """Event berikutnya, None jika timeout (waktunya heartbeat), atau OVERFLOW."""
+        if self.overflowed:
+            return OVERFLOW
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+
+class OrderEventRelay:
+    """
+    Event bus in-process untuk feed live pesanan.
+    Satu thread per worker membaca tabel order_events (id > id terakhir) lalu
+    meneruskannya ke semua koneksi SSE di worker itu, jadi biaya database
+    tidak bertambah dengan jumlah browser yang terhubung. Worker yang menulis
+    event membangunkan relay-nya sendiri setelah commit; worker lain melihat
+    event pada polling berikutnya.
+
+    Id dibagikan saat INSERT, bukan saat commit: di Postgres/MySQL event dengan id
+    lebih kecil bisa terlihat setelah id yang lebih besar. Id yang terlewati dicatat
+    sebagai celah dan dibaca ulang selama ORDER_EVENTS_LOOKBACK_SECONDS. Koneksi
+    yang bergabung saat relay sudah berjalan disusulkan dari posisinya sendiri.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.poll_interval = 1.0
+        self.queue_size = 100
+        self.max_clients = 4
+        self.retention = timedelta(hours=1)
+        self.lookback = 30.0
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._last_id = None
+        # id yang terlewati -> waktu (monotonic) celah itu ditemukan
+        self._gaps = {}
+        self._last_prune = 0.0
+
+    def init_app(self, app):
+        self.app = app
+        self.poll_interval = app.config['SSE_POLL_INTERVAL']
+        self.queue_size = app.config['SSE_QUEUE_SIZE']
+        self.max_clients = max_sse_clients(app.config)
+        self.retention = timedelta(seconds=app.config['ORDER_EVENTS_RETENTION_SECONDS'])
+        self.lookback = app.config['ORDER_EVENTS_LOOKBACK_SECONDS']
+
+    # --- Sisi penulis (dalam transaksi perubahan pesanan) ---
+
+    def record_created(self, order):
+        database.session.add(OrderEvent(order=order, event_type=ORDER_CREATED, status=order.status))
+        database.session.info[PENDING_EVENTS_KEY] = True
+
+    def record_status_changed(self, order_ids, new_status):
+        order_ids = list(order_ids)
+        if not order_ids:
+            return
+        now = datetime.utcnow()
+        database.session.execute(insert(OrderEvent), [
+            {'order_id': order_id, 'event_type': STATUS_CHANGED, 'status': new_status, 'created_at': now}
+            for order_id in order_ids
+        ])
+        database.session.info[PENDING_EVENTS_KEY] = True
+
+    def wake(self):
+        self._wakeup.set()
+
+    # --- Sisi pembaca (koneksi SSE) ---
+
+    def subscribe(self, after_id, delivered_ids=()):
+        """
+        Subscription baru untuk event dengan id > after_id (delivered_ids: event backlog
+        yang sudah dikirim route), atau None jika batas koneksi worker ini sudah tercapai.
+        """
+        with self._lock:
+            if len(self._subscribers) >= self.max_clients:
+                return None
+            if not self._subscribers:
+                # Relay tidak membaca apa pun selama tidak ada koneksi; lanjut dari posisi klien pertama
+                self._last_id = after_id
+                self._gaps.clear()
+            subscription = Subscription(self.queue_size, after_id, delivered_ids)
+            self._subscribers.add(subscription)
+            self._ensure_thread()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def latest_id(self):
+        return database.session.execute(select(func.coalesce(func.max(OrderEvent.id), 0))).scalar()
+
+    def _select_events(self, *criteria):
+        rows = database.session.execute(
+            select(OrderEvent.id, OrderEvent.event_type, OrderEvent.order_id, OrderEvent.status, OrderEvent.created_at)
+            .where(*criteria)
+            .order_by(OrderEvent.id)
+            .limit(EVENT_BATCH_SIZE)
+        ).all()
+        return [_event_dict(row) for row in rows]
+
+    def replay(self, last_event_id):
+        """Event setelah Last-Event-ID (reconnect), dibaca sekali sebelum stream dimulai."""
+        return self._select_events(OrderEvent.id > last_event_id)
+
+    def publish(self, event_data, late=False):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.put(event_data, late)
+
+    # --- Thread relay ---
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='order-event-relay', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            if not self._subscribers:
+                continue
+            try:
+                with self.app.app_context():
+                    self._poll()
+            except Exception:
+                logger.exception('Relay event pesanan gagal membaca order_events')
+
+    def _poll(self):
+        if self._last_id is None:
+            self._last_id = self.latest_id()
+            return
+
+        self._poll_gaps()
+        events = self.replay(self._last_id)
+        for event_data in events:
+            self.publish(event_data)
+        if events:
+            self._record_gaps(events)
+            self._last_id = events[-1]['id']
+            if len(events) == EVENT_BATCH_SIZE:
+                self._wakeup.set()
+        self._catch_up()
+        self._prune_events()
+
+    def _record_gaps(self, events):
+        """Id di antara posisi relay dan event terbaru yang belum terlihat (belum commit atau rollback)."""
+        now = time.monotonic()
+        seen = {event_data['id'] for event_data in events}
+        first_id = max(self._last_id + 1, events[-1]['id'] - EVENT_MAX_GAPS)
+        for event_id in range(first_id, events[-1]['id']):
+            if event_id not in seen:
+                self._gaps[event_id] = now
+        while len(self._gaps) > EVENT_MAX_GAPS:
+            del self._gaps[min(self._gaps)]
+
+    def _poll_gaps(self):
+        """Membaca ulang celah yang masih dalam jendela lookback; celah kedaluwarsa dianggap rollback."""
+        expired = time.monotonic() - self.lookback
+        self._gaps = {event_id: found for event_id, found in self._gaps.items() if found >= expired}
+        if not self._gaps:
+            return
+        for event_data in self._select_events(OrderEvent.id.in_(sorted(self._gaps)[:EVENT_BATCH_SIZE])):
+            del self._gaps[event_data['id']]
+            self.publish(event_data, late=True)
+
+    def _catch_up(self):
+        """Replay per subscriber yang bergabung setelah relay melewati posisi Last-Event-ID-nya."""
+        with self._lock:
+            pending = [subscription for subscription in self._subscribers if subscription.position is not None]
+        for subscription in pending:
+            if subscription.position >= self._last_id:
+                subscription.position = None
+                continue
+            events = self.replay(subscription.position)
+            for event_data in events:
+                subscription.put(event_data)
+            if len(events) == EVENT_BATCH_SIZE:
+                subscription.position = events[-1]['id']
+                self._wakeup.set()
+            else:
+                subscription.position = None
+
+    def _prune_events(self):
+        if time.monotonic() - self._last_prune > 60:
+            self._last_prune = time.monotonic()
+            database.session.execute(delete(OrderEvent).where(OrderEvent.created_at < datetime.utcnow() - self.retention))
+            database.session.commit()
+
+
+order_events = OrderEventRelay()
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_relay_after_commit(session):
+    if session.info.pop(PENDING_EVENTS_KEY, False):
+        order_events.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_events(session):
+    session.info.pop(PENDING_EVENTS_KEY, None)
@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from flask import current_app
+from sqlalchemy import select
+from app.extensions import database
+from app.filters import customer_search
+from app.models.models.order import ServiceOrder
+from app.models.models.role import Role
+from app.models.models.service import LaundryService
+from app.models.models.user import User
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+# (nama kolom di file export, kolom database)
+ORDER_EXPORT_COLUMNS = (
+    ('order_id', ServiceOrder.id),
+    ('order_number', ServiceOrder.order_number),
+    ('order_date', ServiceOrder.order_date),
+    ('status', ServiceOrder.status),
+    ('customer_id', ServiceOrder.user_id),
+    ('customer_username', User.username),
+    ('customer_name', User.full_name),
+    ('service_id', ServiceOrder.service_id),
+    ('service_name', LaundryService.name),
+    ('quantity', ServiceOrder.quantity),
+    ('unit', LaundryService.unit),
+    ('total_price', ServiceOrder.total_price),
+    ('completed_date', ServiceOrder.completed_date),
+)
+
+CUSTOMER_EXPORT_COLUMNS = (
+    ('customer_id', User.id),
+    ('username', User.username),
+    ('full_name', User.full_name),
+    ('email', User.email),
+    ('phone', User.phone),
+    ('address', User.address),
+    ('created_at', User.created_at),
+)
+
+
+def orders_export_query(filters):
+    """SELECT kolom pesanan + nama pelanggan dan layanan, tanpa objek ORM, urut terlama dulu."""
+    query = (
+        select(*(column for _, column in ORDER_EXPORT_COLUMNS))
+        .join(User, ServiceOrder.user_id == User.id)
+        .join(LaundryService, ServiceOrder.service_id == LaundryService.id)
+    )
+    return filters.apply(query).order_by(ServiceOrder.order_date, ServiceOrder.id)
+
+
+def customers_export_query(search=''):
+    query = (
+        select(*(column for _, column in CUSTOMER_EXPORT_COLUMNS))
+        .join(Role, User.role_id == Role.id)
+        .where(Role.name == 'Customer')
+    )
+    if search:
+        query = query.where(customer_search(search))
+    return query.order_by(User.created_at, User.id)
+
+
+def stream_rows(query, batch_size=None):
+    """
+    Membaca hasil query lewat server-side cursor per batch (yield_per),
+    sehingga memori tetap konstan berapa pun jumlah barisnya.
+    """
+    batch_size = batch_size or current_app.config['EXPORT_BATCH_SIZE']
+    result = database.session.execute(query.execution_options(stream_results=True, yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def csv_chunks(header, partitions):
+    """Header lalu satu potongan teks CSV per batch baris."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for rows in partitions:
+        writer.writerows([_plain(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(header, partitions):
+    """Satu objek JSON per baris (newline-delimited JSON), satu potongan per batch."""
+    for rows in partitions:
+        yield ''.join(
+            json.dumps(dict(zip(header, map(_plain, row))), ensure_ascii=False) + '\n'
+            for row in rows
+        )
+
+
+def export_chunks(export_format, columns, query, batch_size=None):
+    """Generator potongan teks file export dalam format 'csv' atau 'ndjson'."""
+    header = [name for name, _ in columns]
+    partitions = stream_rows(query, batch_size)
+    if export_format == 'ndjson':
+        return ndjson_chunks(header, partitions)
+    return csv_chunks(header, partitions)
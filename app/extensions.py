@@ -1,6 +1,7 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_login import LoginManager
+from app.replica import RoutingSession
 
 # Inisialisasi extensions
-database = SQLAlchemy()
-login_manager = LoginManager()
\ No newline at end of file
+database = SQLAlchemy(session_options={'class_': RoutingSession})
+login_manager = LoginManager()
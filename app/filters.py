@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+from sqlalchemy import and_, func, or_, text
+from app.models.models.order import ORDER_STATUSES, OPEN_STATUSES, OPEN_STATUS_SQL, ServiceOrder
+from app.models.models.user import User
+
+
+def prefix_upper_bound(prefix):
+    """String terkecil yang lebih besar dari semua string berawalan prefix ('abc' -> 'abd')."""
+    return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def prefix_match(column, prefix, case_insensitive=True):
+    """
+    Filter awalan sebagai range (>= prefix AND < batas atas), bukan LIKE,
+    agar bisa memakai index biasa maupun index ekspresi lower(kolom) di SQLite dan Postgres.
+    """
+    if case_insensitive:
+        column = func.lower(column)
+        prefix = prefix.lower()
+    return and_(column >= prefix, column < prefix_upper_bound(prefix))
+
+
+def customer_search(search):
+    """Pencarian awalan pelanggan pada username, nama lengkap, email, atau telepon."""
+    return or_(
+        prefix_match(User.username, search),
+        prefix_match(User.full_name, search),
+        prefix_match(User.email, search),
+        prefix_match(User.phone, search, case_insensitive=False)
+    )
+
+
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value) if value else None
+    except ValueError:
+        return None
+
+
+@dataclass(frozen=True)
+class OrderFilters:
+    """
+    Filter daftar pesanan dari query string: ?status=&date_from=&date_to=&service_id=&customer_id=.
+    Nilai yang tidak valid diabaikan, bukan error. Dipakai bersama oleh halaman
+    manajemen pesanan, antrian kerja, dan export.
+    """
+    statuses: Tuple[str, ...] = ()
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    service_id: Optional[int] = None
+    customer_id: Optional[int] = None
+
+    @classmethod
+    def from_args(cls, args, default_statuses=()):
+        statuses = tuple(status for status in ORDER_STATUSES if status in args.getlist('status'))
+        return cls(
+            statuses=statuses or tuple(default_statuses),
+            date_from=_parse_date(args.get('date_from')),
+            date_to=_parse_date(args.get('date_to')),
+            service_id=args.get('service_id', type=int),
+            customer_id=args.get('customer_id', type=int),
+        )
+
+    def to_args(self):
+        """Kebalikan from_args: argumen url_for untuk link export/halaman lain dengan filter yang sama."""
+        args = {
+            'status': list(self.statuses),
+            'date_from': self.date_from.isoformat() if self.date_from else None,
+            'date_to': self.date_to.isoformat() if self.date_to else None,
+            'service_id': self.service_id,
+            'customer_id': self.customer_id,
+        }
+        return {key: value for key, value in args.items() if value}
+
+    @property
+    def is_active(self):
+        return any((self.statuses, self.date_from, self.date_to, self.service_id, self.customer_id))
+
+    def status_clause(self):
+        # Predikat status terbuka ditulis literal agar cocok dengan WHERE partial index
+        # ix_service_orders_open_queue (parameter terikat tidak dikenali SQLite/Postgres)
+        if set(self.statuses) == set(OPEN_STATUSES):
+            return text(OPEN_STATUS_SQL)
+        if len(self.statuses) == 1:
+            return ServiceOrder.status == self.statuses[0]
+        return ServiceOrder.status.in_(self.statuses)
+
+    def apply(self, query):
+        """Menambahkan filter ke query/select ServiceOrder; semuanya tercakup index komposit *_order_date_id."""
+        if self.statuses:
+            query = query.filter(self.status_clause())
+        if self.service_id:
+            query = query.filter(ServiceOrder.service_id == self.service_id)
+        if self.customer_id:
+            query = query.filter(ServiceOrder.user_id == self.customer_id)
+        if self.date_from:
+            query = query.filter(ServiceOrder.order_date >= datetime.combine(self.date_from, datetime.min.time()))
+        if self.date_to:
+            # date_to inklusif: sampai sebelum tengah malam hari berikutnya
+            end = datetime.combine(self.date_to + timedelta(days=1), datetime.min.time())
+            query = query.filter(ServiceOrder.order_date < end)
+        return query
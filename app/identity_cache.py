@@ -0,0 +1,214 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from flask_login import UserMixin
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session, object_session
+from app.extensions import database
+from app.models.models.role import Role
+from app.models.models.user import User
+from app.replica import replica_routing
+from app.versioning import SharedVersion
+
+# Penanda di session.info: id user yang berubah di transaksi ini, atau ALL_USERS jika role berubah
+PENDING_INVALIDATION_KEY = 'identity_cache_pending'
+ALL_USERS = 'all'
+
+# Kolom yang disalin ke snapshot; perubahan kolom lain (hash password saat rehash login,
+# updated_at) tidak membuang cache semua worker
+CACHED_USER_COLUMNS = ('username', 'email', 'full_name', 'phone', 'address', 'role_id', 'created_at')
+CACHED_ROLE_COLUMNS = ('name',)
+
+
+@dataclass(frozen=True)
+class RoleSnapshot:
+    """Salinan ringan data role untuk current_user."""
+    id: int
+    name: str
+
+
+@dataclass(frozen=True, eq=False)
+class UserSnapshot(UserMixin):
+    """
+    Salinan ringan data user + role yang disimpan di identity cache.
+    Tidak terikat ke session database dan tidak menyimpan hash password.
+    """
+    id: int
+    username: str
+    email: str
+    full_name: str
+    phone: Optional[str]
+    address: Optional[str]
+    role_id: int
+    role: RoleSnapshot
+    created_at: Optional[datetime]
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.username}>'
+
+    def is_karyawan(self):
+        """Helper method untuk mengecek apakah user adalah karyawan"""
+        return self.role.name == 'Karyawan'
+
+
+class IdentityCache:
+    """
+    Cache identitas per proses dengan TTL dan eviction LRU.
+    Dipakai oleh user_loader agar request yang sudah login tidak perlu query user dan role.
+    Perubahan user/role yang di-commit menaikkan versi identitas bersama, sehingga
+    snapshot lama di semua worker dibuang pada request berikutnya.
+    """
+
+    def __init__(self, ttl=60, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.version = SharedVersion('identity')
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.version.init_app(app)
+        self.configure(ttl=app.config['IDENTITY_CACHE_TTL'], maxsize=app.config['IDENTITY_CACHE_SIZE'])
+
+    def configure(self, ttl, maxsize):
+        with self._lock:
+            self.ttl = ttl
+            self.maxsize = maxsize
+            self._entries.clear()
+
+    def get(self, user_id):
+        version = self.version.get()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            snapshot, expires_at, entry_version = entry
+            if expires_at < time.monotonic() or entry_version != version:
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id)
+            return snapshot
+
+    def put(self, snapshot, version):
+        if self.ttl <= 0 or self.maxsize <= 0:
+            return
+
+        with self._lock:
+            self._entries[snapshot.id] = (snapshot, time.monotonic() + self.ttl, version)
+            self._entries.move_to_end(snapshot.id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def bump(self):
+        """Dipanggil setelah perubahan user/role di-commit; berlaku untuk semua worker."""
+        return self.version.bump()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, user_id):
+        """
+        Mengambil snapshot user dari cache, atau dari database (satu query join role) jika belum ada.
+        """
+        snapshot = self.get(user_id)
+        if snapshot is not None:
+            return snapshot
+
+        # Versi dibaca sebelum query: jika ada bump di tengah jalan, snapshot ini langsung basi
+        version = self.version.get()
+        with replica_routing.primary():
+            row = database.session.execute(
+                select(
+                    User.id, User.username, User.email, User.full_name, User.phone,
+                    User.address, User.role_id, User.created_at, Role.name
+                )
+                .join(Role, User.role_id == Role.id)
+                .where(User.id == user_id)
+            ).first()
+        if row is None:
+            return None
+
+        snapshot = UserSnapshot(
+            id=row.id,
+            username=row.username,
+            email=row.email,
+            full_name=row.full_name,
+            phone=row.phone,
+            address=row.address,
+            role_id=row.role_id,
+            role=RoleSnapshot(id=row.role_id, name=row.name),
+            created_at=row.created_at
+        )
+        self.put(snapshot, version)
+        return snapshot
+
+
+identity_cache = IdentityCache()
+
+
+def _cached_columns_changed(target, columns):
+    attrs = inspect(target).attrs
+    return any(attrs[column].history.has_changes() for column in columns)
+
+
+def _mark_pending(target, user_id):
+    session = object_session(target)
+    if session is None:
+        return
+    pending = session.info.setdefault(PENDING_INVALIDATION_KEY, set())
+    pending.add(user_id)
+
+
+@event.listens_for(User, 'after_update')
+def _invalidate_updated_user(mapper, connection, target):
+    if _cached_columns_changed(target, CACHED_USER_COLUMNS):
+        _mark_pending(target, target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def _invalidate_user(mapper, connection, target):
+    # Belum di-commit: worker lain bisa memuat ulang data lama jika cache dibuang sekarang
+    _mark_pending(target, target.id)
+
+
+@event.listens_for(Role, 'after_update')
+def _invalidate_updated_role(mapper, connection, target):
+    if _cached_columns_changed(target, CACHED_ROLE_COLUMNS):
+        _mark_pending(target, ALL_USERS)
+
+
+@event.listens_for(Role, 'after_delete')
+def _invalidate_role(mapper, connection, target):
+    # Perubahan role berdampak ke banyak user sekaligus
+    _mark_pending(target, ALL_USERS)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_after_commit(session):
+    pending = session.info.pop(PENDING_INVALIDATION_KEY, None)
+    if not pending:
+        return
+    if ALL_USERS in pending:
+        identity_cache.clear()
+    else:
+        for user_id in pending:
+            identity_cache.invalidate(user_id)
+    identity_cache.bump()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_invalidation(session):
+    session.info.pop(PENDING_INVALIDATION_KEY, None)
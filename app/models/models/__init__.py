@@ -2,5 +2,9 @@ from .user import User
 from .role import Role
 from .service import LaundryService
 from .order import ServiceOrder
+from .meta import AppMeta
+from .rollup import OrderDailyRollup, OrderStatusTotal
+from .event import OrderEvent
+from .outbox import OutboxMessage
 
-__all__ = ['User', 'Role', 'LaundryService', 'ServiceOrder']
\ No newline at end of file
+__all__ = ['User', 'Role', 'LaundryService', 'ServiceOrder', 'AppMeta', 'OrderDailyRollup', 'OrderStatusTotal', 'OrderEvent', 'OutboxMessage']
\ No newline at end of file
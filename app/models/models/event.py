@@ -0,0 +1,22 @@
+from app.extensions import database
+from datetime import datetime
+
+class OrderEvent(database.Model):
+    """
+    Model log event pesanan (dibuat, status berubah) untuk feed live halaman karyawan.
+    Ditulis dalam transaksi yang sama dengan perubahan pesanan dan dibaca oleh
+    relay di setiap worker; baris lama dihapus setelah masa simpan habis.
+    """
+    __tablename__ = 'order_events'
+    
+    id = database.Column(database.Integer, primary_key=True)
+    order_id = database.Column(database.Integer, database.ForeignKey('service_orders.id'), nullable=False)
+    event_type = database.Column(database.String(30), nullable=False)  # order_created, status_changed
+    status = database.Column(database.String(20), nullable=False)
+    created_at = database.Column(database.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    # Relasi agar event pesanan baru bisa dibuat sebelum id pesanan diketahui (sebelum flush)
+    order = database.relationship('ServiceOrder')
+    
+    def __repr__(self):
+        return f'<OrderEvent {self.id} {self.event_type} #{self.order_id}>'
@@ -0,0 +1,16 @@
+from app.extensions import database
+from datetime import datetime
+
+class AppMeta(database.Model):
+    """
+    Model key-value untuk metadata internal aplikasi.
+    Dipakai untuk mencatat revisi skema database yang sudah diterapkan.
+    """
+    __tablename__ = 'app_meta'
+    
+    key = database.Column(database.String(50), primary_key=True)
+    value = database.Column(database.String(200), nullable=False)
+    updated_at = database.Column(database.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<AppMeta {self.key}={self.value}>'
@@ -1,5 +1,90 @@
 from app.extensions import database
+from app.money import format_rupiah
 from datetime import datetime
+from sqlalchemy.types import SmallInteger, TypeDecorator
+
+# Urutan di sini adalah kode status di database (0 = pending, 1 = processing, ...),
+# jangan diubah urutannya tanpa migrasi data
+ORDER_STATUSES = ('pending', 'processing', 'ready', 'delivered', 'cancelled')
+STATUS_CODES = {status: code for code, status in enumerate(ORDER_STATUSES)}
+
+# Status pesanan yang masih dikerjakan (antrian kerja karyawan)
+OPEN_STATUSES = ('pending', 'processing')
+# Literal (bukan bind parameter) agar SQLite/Postgres memakai partial index antrian
+OPEN_STATUS_SQL = "status IN ({})".format(', '.join(str(STATUS_CODES[status]) for status in OPEN_STATUSES))
+
+# Satu-satunya definisi perpindahan status yang sah (karyawan, perorangan maupun massal)
+ALLOWED_TRANSITIONS = {
+    'pending': ('processing', 'cancelled'),
+    'processing': ('ready', 'cancelled'),
+    'ready': ('delivered',),
+    'delivered': (),
+    'cancelled': (),
+}
+
+# Customer hanya boleh membatalkan pesanan yang belum diproses
+CUSTOMER_TRANSITIONS = {
+    'pending': ('cancelled',),
+}
+
+# Status yang mengisi completed_date (pesanan selesai dikerjakan)
+COMPLETED_STATUSES = ('ready', 'delivered')
+
+
+def normalize_status(status):
+    return (status or 'pending').strip().lower()
+
+
+def legacy_status_code(value):
+    """
+    Kode status untuk nilai status lama (teks bebas huruf besar/kecil dan spasi, atau kode
+    yang sudah dikonversi). NULL dan teks yang tidak dikenal menjadi pending.
+    """
+    if isinstance(value, int):
+        return value if 0 <= value < len(ORDER_STATUSES) else STATUS_CODES['pending']
+    return STATUS_CODES.get(normalize_status(value), STATUS_CODES['pending'])
+
+
+def legacy_status_code_sql(column):
+    """Padanan SQL legacy_status_code() untuk kolom status teks: CASE ... ELSE pending."""
+    cases = ' '.join(f"WHEN '{status}' THEN {code}" for code, status in enumerate(ORDER_STATUSES))
+    return f"CASE lower(trim({column})) {cases} ELSE {STATUS_CODES['pending']} END"
+
+
+def can_transition(old_status, new_status, transitions=ALLOWED_TRANSITIONS):
+    """True jika status boleh dipindah dari old_status ke new_status menurut tabel transitions."""
+    return new_status in transitions.get(normalize_status(old_status), ())
+
+
+class OrderStatusType(TypeDecorator):
+    """
+    Status pesanan disimpan sebagai SMALLINT (kode di ORDER_STATUSES), tetapi di Python
+    dan template tetap berupa string seperti 'pending'. Perbandingan dengan string
+    di query (== , in_) ikut dikonversi ke kode, jadi filter status memakai index.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, int):
+            return value
+        try:
+            return STATUS_CODES[normalize_status(value)]
+        except KeyError:
+            raise ValueError(f'Status pesanan tidak dikenal: {value!r}') from None
+
+    def process_literal_param(self, value, dialect):
+        return str(self.process_bind_param(value, dialect))
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return ORDER_STATUSES[int(value)]
+
+    @property
+    def python_type(self):
+        return str
+
 
 class ServiceOrder(database.Model):
     """
@@ -7,12 +92,26 @@ class ServiceOrder(database.Model):
     Mencatat transaksi antara customer dan service.
     """
     __tablename__ = 'service_orders'
+    __table_args__ = (
+        # Keyset pagination daftar pesanan (semua pesanan dan per customer)
+        database.Index('ix_service_orders_order_date_id', 'order_date', 'id'),
+        database.Index('ix_service_orders_user_order_date_id', 'user_id', 'order_date', 'id'),
+        # Filter antrian pesanan per status dan per layanan dalam rentang tanggal
+        database.Index('ix_service_orders_status_order_date_id', 'status', 'order_date', 'id'),
+        database.Index('ix_service_orders_service_order_date_id', 'service_id', 'order_date', 'id'),
+        # Partial index: hanya pesanan yang masih terbuka, tetap kecil meski riwayat terus bertambah
+        database.Index(
+            'ix_service_orders_open_queue', 'order_date', 'id',
+            postgresql_where=database.text(OPEN_STATUS_SQL),
+            sqlite_where=database.text(OPEN_STATUS_SQL)
+        ),
+    )
     
     id = database.Column(database.Integer, primary_key=True)
     order_number = database.Column(database.String(50), unique=True, nullable=False)
-    quantity = database.Column(database.Numeric(10, 2), nullable=False)
-    total_price = database.Column(database.Numeric(12, 2), nullable=False)
-    status = database.Column(database.String(20), default='Pending')  # Pending, Processing, Completed, Cancelled
+    quantity = database.Column(database.Integer, nullable=False)
+    total_price = database.Column(database.Integer, nullable=False)  # rupiah
+    status = database.Column(OrderStatusType(), nullable=False, default='pending')  # lihat ORDER_STATUSES
     notes = database.Column(database.Text)
     pickup_address = database.Column(database.Text)
     delivery_address = database.Column(database.Text)
@@ -26,6 +125,9 @@ class ServiceOrder(database.Model):
     def __repr__(self):
         return f'<ServiceOrder {self.order_number}>'
     
+    def can_change_status(self, new_status, transitions=ALLOWED_TRANSITIONS):
+        return can_transition(self.status, new_status, transitions)
+    
     def get_formatted_total(self):
         """Helper method untuk format total harga dalam rupiah"""
-        return f"Rp {self.total_price:,.0f}".replace(',', '.')
\ No newline at end of file
+        return format_rupiah(self.total_price)
\ No newline at end of file
@@ -0,0 +1,36 @@
+from app.extensions import database
+from datetime import datetime
+
+class OutboxMessage(database.Model):
+    """
+    Model transactional outbox: efek samping pesanan (notifikasi, webhook, struk)
+    dicatat dalam transaksi yang sama dengan perubahan pesanan, lalu dikirim
+    oleh dispatcher di background dengan retry (at-least-once).
+    """
+    __tablename__ = 'outbox_messages'
+    __table_args__ = (
+        # Hanya pesan yang belum terkirim yang dipindai dispatcher
+        database.Index(
+            'ix_outbox_messages_pending', 'available_at', 'id',
+            postgresql_where=database.text("status = 'pending'"),
+            sqlite_where=database.text("status = 'pending'")
+        ),
+        database.Index('ix_outbox_messages_lease_token', 'lease_token'),
+    )
+    
+    id = database.Column(database.Integer, primary_key=True)
+    topic = database.Column(database.String(50), nullable=False)  # order.created, order.status_changed
+    payload = database.Column(database.Text, nullable=False)  # JSON
+    status = database.Column(database.String(20), nullable=False, default='pending')  # pending, done, dead
+    attempts = database.Column(database.Integer, nullable=False, default=0)
+    last_error = database.Column(database.Text)
+    created_at = database.Column(database.DateTime, default=datetime.utcnow, nullable=False)
+    available_at = database.Column(database.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # Lease: dispatcher yang mengklaim pesan; lease kedaluwarsa berarti pesan boleh diklaim ulang
+    lease_token = database.Column(database.String(36))
+    locked_until = database.Column(database.DateTime)
+    dispatched_at = database.Column(database.DateTime)
+    
+    def __repr__(self):
+        return f'<OutboxMessage {self.id} {self.topic} {self.status}>'
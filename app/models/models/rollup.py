@@ -0,0 +1,36 @@
+from app.extensions import database
+from app.models.models.order import OrderStatusType
+
+class OrderDailyRollup(database.Model):
+    """
+    Model ringkasan pesanan harian per layanan dan status.
+    Diperbarui dalam transaksi yang sama dengan perubahan pesanan,
+    sehingga laporan tidak perlu memindai seluruh tabel service_orders.
+    """
+    __tablename__ = 'order_daily_rollups'
+    
+    day = database.Column(database.Date, primary_key=True)
+    service_id = database.Column(database.Integer, database.ForeignKey('laundry_services.id'), primary_key=True)
+    status = database.Column(OrderStatusType(), primary_key=True)
+    order_count = database.Column(database.Integer, nullable=False, default=0)
+    quantity = database.Column(database.BigInteger, nullable=False, default=0)
+    revenue = database.Column(database.BigInteger, nullable=False, default=0)  # rupiah
+    
+    def __repr__(self):
+        return f'<OrderDailyRollup {self.day} {self.service_id} {self.status}>'
+
+
+class OrderStatusTotal(database.Model):
+    """
+    Model total berjalan pesanan per status (seluruh riwayat), diperbarui bersama
+    rollup harian. Dashboard cukup membaca satu baris per status.
+    """
+    __tablename__ = 'order_status_totals'
+    
+    status = database.Column(OrderStatusType(), primary_key=True, autoincrement=False)
+    order_count = database.Column(database.Integer, nullable=False, default=0)
+    quantity = database.Column(database.BigInteger, nullable=False, default=0)
+    revenue = database.Column(database.BigInteger, nullable=False, default=0)  # rupiah
+    
+    def __repr__(self):
+        return f'<OrderStatusTotal {self.status}>'
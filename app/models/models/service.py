@@ -1,4 +1,5 @@
 from app.extensions import database
+from app.money import format_rupiah
 from datetime import datetime
 
 class LaundryService(database.Model):
@@ -11,7 +12,7 @@ class LaundryService(database.Model):
     id = database.Column(database.Integer, primary_key=True)
     name = database.Column(database.String(100), nullable=False)
     description = database.Column(database.Text, nullable=False)
-    price = database.Column(database.Numeric(10, 2), nullable=False)
+    price = database.Column(database.Integer, nullable=False)  # rupiah
     unit = database.Column(database.String(20), nullable=False)  # per kg, per item, per meter, dll
     duration = database.Column(database.String(50))  # estimasi waktu pengerjaan
     image_url = database.Column(database.String(500))
@@ -27,4 +28,4 @@ class LaundryService(database.Model):
     
     def get_formatted_price(self):
         """Helper method untuk format harga dalam rupiah"""
-        return f"Rp {self.price:,.0f}".replace(',', '.')
\ No newline at end of file
+        return format_rupiah(self.price)
\ No newline at end of file
@@ -30,4 +30,11 @@ class User(UserMixin, database.Model):
     
     def is_karyawan(self):
         """Helper method untuk mengecek apakah user adalah karyawan"""
-        return self.role.name == 'Karyawan'
\ No newline at end of file
+        return self.role.name == 'Karyawan'
+
+# Index untuk pencarian awalan (case-insensitive) dan keyset pagination di halaman pelanggan
+database.Index('ix_users_lower_username', database.func.lower(User.username))
+database.Index('ix_users_lower_full_name', database.func.lower(User.full_name))
+database.Index('ix_users_lower_email', database.func.lower(User.email))
+database.Index('ix_users_phone', User.phone)
+database.Index('ix_users_role_created_at_id', User.role_id, User.created_at, User.id)
\ No newline at end of file
@@ -1,10 +1,31 @@
-from flask import Blueprint, render_template, redirect, url_for, flash, request
+from flask import Blueprint, Response, current_app, render_template, redirect, url_for, flash, request, jsonify, stream_with_context
 from flask_login import login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+import time
 from functools import wraps
+from datetime import datetime
 from app.extensions import database
+from app.catalog import catalog_cache
+from app.money import to_rupiah
+from app.events import OVERFLOW, format_sse, order_events
+from app.search import service_search
+from app.exports import (
+    CUSTOMER_EXPORT_COLUMNS, EXPORT_FORMATS, ORDER_EXPORT_COLUMNS,
+    customers_export_query, export_chunks, orders_export_query
+)
+from app.filters import OrderFilters, customer_search
+from app.order_status import BULK_STATUS_MAX_ORDERS, CONFLICT, UPDATED, bulk_update_status, update_status
+from app.pagination import get_page_size, keyset_paginate
+from app.db_pool import pool_metrics, pool_status
+from app.query_budget import query_budget, stream_within_budget
+from app.replica import read_replica
+from app.sqlite_profile import retry_on_lock
+from app.reports import dashboard_stats, order_status_summary
 from app.models.models.service import LaundryService
-from app.models.models.order import ServiceOrder
+from app.models.models.order import ALLOWED_TRANSITIONS, ORDER_STATUSES, OPEN_STATUSES, ServiceOrder
 from app.models.models.user import User
+from app.models.models.role import Role
 
 admin_blueprint = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -25,43 +46,12 @@ def karyawan_required(function):
 @admin_blueprint.route('/dashboard')
 @login_required
 @karyawan_required
+@query_budget(4)
+@read_replica
 def dashboard():
-    total_services = LaundryService.query.count()
-    active_services = LaundryService.query.filter_by(is_active=True).count()
-    total_users = User.query.count()
-    total_orders = ServiceOrder.query.count()
-
-    total_revenue = ServiceOrder.query.with_entities(ServiceOrder.total_price).all()
-    total_revenue = sum(price[0] for price in total_revenue) if total_revenue else 0
-
-    pending_orders = ServiceOrder.query.filter_by(status='pending').count()
-    processing_orders = ServiceOrder.query.filter_by(status='processing').count()
-    completed_orders = ServiceOrder.query.filter_by(status='ready').count() + ServiceOrder.query.filter_by(status='delivered').count()
-    pending_revenue = ServiceOrder.query.filter_by(status='pending').with_entities(ServiceOrder.total_price).all()
-    pending_revenue = sum(price[0] for price in pending_revenue) if pending_revenue else 0
-
-    processing_revenue = ServiceOrder.query.filter_by(status='processing').with_entities(ServiceOrder.total_price).all()
-    processing_revenue = sum(price[0] for price in processing_revenue) if processing_revenue else 0
-
-    completed_revenue = ServiceOrder.query.filter(ServiceOrder.status.in_(['ready', 'delivered'])).with_entities(ServiceOrder.total_price).all()
-    completed_revenue = sum(price[0] for price in completed_revenue) if completed_revenue else 0
-
+    stats = dashboard_stats()
     recent_services = LaundryService.query.order_by(LaundryService.created_at.desc()).limit(5).all()
 
-    stats = {
-        'total_services': total_services,
-        'active_services': active_services,
-        'total_users': total_users,
-        'total_orders': total_orders,
-        'total_revenue': total_revenue,
-        'pending_orders': pending_orders,
-        'processing_orders': processing_orders,
-        'completed_orders': completed_orders,
-        'pending_revenue': pending_revenue,
-        'processing_revenue': processing_revenue,
-        'completed_revenue': completed_revenue
-    }
-
     return render_template('admin/dashboard.html', stats=stats, recent_services=recent_services)
 
 @admin_blueprint.route('/services')
@@ -93,7 +83,7 @@ def create_service():
             return render_template('admin/edit_service.html', service=None)
         
         try:
-            price = float(price)
+            price = to_rupiah(price)
             if price < 0:
                 raise ValueError()
         except ValueError:
@@ -113,7 +103,10 @@ def create_service():
             )
             
             database.session.add(new_service)
+            database.session.flush()
+            service_search.index_service(new_service)
             database.session.commit()
+            catalog_cache.bump()
             
             flash(f'Layanan "{name}" berhasil ditambahkan!', 'success')
             return redirect(url_for('admin.manage_services'))
@@ -135,16 +128,26 @@ def edit_service(service_id):
     service = LaundryService.query.get_or_404(service_id)
     
     if request.method == 'POST':
+        try:
+            price = to_rupiah(request.form.get('price'))
+            if price < 0:
+                raise ValueError()
+        except (ValueError, TypeError):
+            flash('Harga harus berupa angka positif.', 'danger')
+            return render_template('admin/edit_service.html', service=service)
+
         service.name = request.form.get('name')
         service.description = request.form.get('description')
-        service.price = float(request.form.get('price'))
+        service.price = price
         service.unit = request.form.get('unit')
         service.duration = request.form.get('duration')
         service.image_url = request.form.get('image_url')
         is_active = request.form.get('is_active')
         service.is_active = True if is_active == 'on' else False
         
+        service_search.index_service(service)
         database.session.commit()
+        catalog_cache.bump()
         
         flash(f'Layanan "{service.name}" berhasil diperbarui!', 'success')
         return redirect(url_for('admin.manage_services'))
@@ -164,7 +167,9 @@ def delete_service(service_id):
     
     # Hard delete - hapus dari database
     database.session.delete(service)
+    service_search.remove_service(service_id)
     database.session.commit()
+    catalog_cache.bump()
     
     flash(f'Layanan "{service_name}" berhasil dihapus!', 'success')
     return redirect(url_for('admin.manage_services'))
@@ -172,43 +177,270 @@ def delete_service(service_id):
 @admin_blueprint.route('/customers')
 @login_required
 @karyawan_required
+@query_budget(3)
+@read_replica
 def manage_customers():
     """
     Halaman manajemen pelanggan.
-    Menampilkan daftar semua pelanggan dengan informasi lengkap.
+    Menampilkan daftar pelanggan per halaman, dengan pencarian awalan
+    pada username, nama lengkap, email, atau telepon.
     """
-    customers = User.query.filter_by(role_id=2).order_by(User.created_at.desc()).all()  # role_id 2 = Customer
-    return render_template('admin/manage_customers.html', customers=customers)
+    search = request.args.get('q', '').strip()
+    customers = User.query.join(Role, User.role_id == Role.id).filter(Role.name == 'Customer')
+    if search:
+        customers = customers.filter(customer_search(search))
+
+    page = keyset_paginate(
+        customers, User.created_at, User.id,
+        request.args.get('cursor'), get_page_size('CUSTOMERS_PAGE_SIZE')
+    )
+
+    # Jumlah pesanan hanya untuk pelanggan di halaman ini, satu query GROUP BY
+    order_counts = {}
+    if page.items:
+        order_counts = dict(
+            database.session.query(ServiceOrder.user_id, func.count(ServiceOrder.id))
+            .filter(ServiceOrder.user_id.in_([customer.id for customer in page.items]))
+            .group_by(ServiceOrder.user_id)
+            .all()
+        )
+
+    return render_template(
+        'admin/manage_customers.html',
+        customers=page.items, page=page, order_counts=order_counts, search=search
+    )
+
+@admin_blueprint.route('/customers/export')
+@login_required
+@karyawan_required
+@query_budget(2)
+def export_customers():
+    """Export pelanggan (?format=csv|ndjson, ?q= sama seperti pencarian) secara streaming."""
+    query = customers_export_query(request.args.get('q', '').strip())
+    return export_response('pelanggan', CUSTOMER_EXPORT_COLUMNS, query)
 
 @admin_blueprint.route('/orders')
 @login_required
 @karyawan_required
+@query_budget(6)
+@read_replica
 def manage_orders():
     """
     Halaman manajemen pesanan untuk karyawan.
-    Menampilkan semua pesanan dari semua pelanggan dengan opsi update status.
+    Menampilkan semua pesanan dari semua pelanggan dengan opsi update status,
+    bisa difilter per status, rentang tanggal, layanan, dan pelanggan.
+    """
+    filters = OrderFilters.from_args(request.args)
+    all_orders = filters.apply(ServiceOrder.query).options(
+        selectinload(ServiceOrder.customer),
+        selectinload(ServiceOrder.service)
+    )
+    page = keyset_paginate(
+        all_orders, ServiceOrder.order_date, ServiceOrder.id,
+        request.args.get('cursor'), get_page_size()
+    )
+
+    # Ringkasan status dihitung di database, bukan dari halaman yang sedang tampil
+    status_counts = {status: order_count for status, (order_count, _) in order_status_summary().items()}
+    return render_template(
+        'admin/manage_orders.html', orders=page.items, page=page, status_counts=status_counts,
+        allowed_transitions=ALLOWED_TRANSITIONS,
+        filters=filters, services=catalog_cache.active_services(), queue_mode=False
+    )
+
+@admin_blueprint.route('/orders/queue')
+@login_required
+@karyawan_required
+@query_budget(6)
+@read_replica
+def order_queue():
+    """
+    Antrian kerja karyawan: pesanan yang masih menunggu/diproses, terlama dulu.
+    Memakai partial index ix_service_orders_open_queue, sehingga tetap cepat
+    walaupun riwayat pesanan selesai terus bertambah.
+    """
+    filters = OrderFilters.from_args(request.args, default_statuses=OPEN_STATUSES)
+    open_orders = filters.apply(ServiceOrder.query).options(
+        selectinload(ServiceOrder.customer),
+        selectinload(ServiceOrder.service)
+    )
+    page = keyset_paginate(
+        open_orders, ServiceOrder.order_date, ServiceOrder.id,
+        request.args.get('cursor'), get_page_size(), descending=False
+    )
+
+    status_counts = {status: order_count for status, (order_count, _) in order_status_summary().items()}
+    return render_template(
+        'admin/manage_orders.html', orders=page.items, page=page, status_counts=status_counts,
+        allowed_transitions=ALLOWED_TRANSITIONS,
+        filters=filters, services=catalog_cache.active_services(), queue_mode=True
+    )
+
+@admin_blueprint.route('/orders/export')
+@login_required
+@karyawan_required
+@query_budget(2)
+def export_orders():
+    """Export pesanan (?format=csv|ndjson) dengan filter yang sama seperti daftar pesanan."""
+    query = orders_export_query(OrderFilters.from_args(request.args))
+    return export_response('pesanan', ORDER_EXPORT_COLUMNS, query)
+
+def export_response(name, columns, query):
+    """
+    Respons streaming: baris dikirim per batch selama dibaca dari database,
+    sehingga export ratusan ribu baris tidak perlu dimuat ke memori worker.
     """
-    all_orders = ServiceOrder.query.order_by(ServiceOrder.order_date.desc()).all()
-    return render_template('admin/manage_orders.html', orders=all_orders)
+    export_format = request.args.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        export_format = 'csv'
+    filename = f'{name}-{datetime.utcnow():%Y%m%d-%H%M%S}.{export_format}'
+    return Response(
+        stream_with_context(stream_within_budget(export_chunks(export_format, columns, query))),
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@admin_blueprint.route('/orders/events')
+@login_required
+@karyawan_required
+@query_budget(2)
+def order_events_stream():
+    """
+    Feed live pesanan (server-sent events) untuk halaman karyawan.
+    Database hanya dibaca sekali saat koneksi dibuka (replay sejak Last-Event-ID);
+    selanjutnya event datang dari relay in-process, dengan heartbeat untuk
+    koneksi yang menganggur. Stream ditutup setelah SSE_STREAM_SECONDS dan
+    browser otomatis menyambung lagi, sehingga kapasitas worker tidak tertahan selamanya.
+    """
+    config = current_app.config
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    if last_event_id is None:
+        backlog, after_id = [], order_events.latest_id()
+    else:
+        backlog = order_events.replay(last_event_id)
+        after_id = backlog[-1]['id'] if backlog else last_event_id
+
+    subscription = order_events.subscribe(after_id, [event_data['id'] for event_data in backlog])
+    if subscription is None:
+        return Response('Terlalu banyak koneksi live.', 503, headers={'Retry-After': '10'})
+
+    # Koneksi database dikembalikan ke pool sebelum stream panjang dimulai
+    database.session.remove()
+
+    def stream():
+        try:
+            # Posisi awal klien, dipakai sebagai Last-Event-ID jika putus sebelum ada event
+            yield f"retry: 5000\nid: {last_event_id if backlog else after_id}\n\n"
+            for event_data in backlog:
+                yield format_sse(event_data)
+            deadline = time.monotonic() + config['SSE_STREAM_SECONDS']
+            while time.monotonic() < deadline:
+                event_data = subscription.get(timeout=config['SSE_HEARTBEAT_SECONDS'])
+                if event_data is OVERFLOW:
+                    break
+                yield ': ping\n\n' if event_data is None else format_sse(event_data)
+        finally:
+            order_events.unsubscribe(subscription)
+
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no',
+    })
+
+def orders_return_url():
+    """Kembali ke daftar/antrian pesanan beserta filternya (hanya path di bawah /admin/orders)."""
+    next_url = request.form.get('next', '')
+    if next_url.startswith(url_for('admin.manage_orders')) and not next_url.startswith('//'):
+        return next_url
+    return url_for('admin.manage_orders')
 
 @admin_blueprint.route('/orders/update/<int:order_id>', methods=['POST'])
 @login_required
 @karyawan_required
+@retry_on_lock
 def update_order_status(order_id):
     """
     UPDATE: Mengubah status pesanan.
     Hanya karyawan yang bisa mengubah status pesanan.
     """
-    order = ServiceOrder.query.get_or_404(order_id)
+    # Baris dikunci (Postgres/MySQL) agar dua perubahan status bersamaan tidak lolos validasi berdua
+    order = ServiceOrder.query.filter_by(id=order_id).with_for_update().first_or_404()
     new_status = request.form.get('status')
     
-    valid_statuses = ['pending', 'processing', 'ready', 'delivered', 'cancelled']
-    if new_status not in valid_statuses:
+    if new_status not in ORDER_STATUSES:
         flash('Status pesanan tidak valid.', 'danger')
-        return redirect(url_for('admin.manage_orders'))
+        return redirect(orders_return_url())
     
-    order.status = new_status
-    database.session.commit()
+    if new_status == order.status:
+        flash(f'Status pesanan #{order.id} sudah {new_status}.', 'info')
+        return redirect(orders_return_url())
     
-    flash(f'Status pesanan #{order.id} berhasil diubah menjadi {new_status}.', 'success')
-    return redirect(url_for('admin.manage_orders'))
\ No newline at end of file
+    if not order.can_change_status(new_status):
+        flash(f'Status pesanan #{order.id} tidak bisa diubah dari {order.status} menjadi {new_status}.', 'warning')
+        return redirect(orders_return_url())
+    
+    if update_status(order, new_status) == CONFLICT:
+        flash(f'Status pesanan #{order_id} baru saja diubah oleh request lain, silakan coba lagi.', 'warning')
+        return redirect(orders_return_url())
+    
+    flash(f'Status pesanan #{order_id} berhasil diubah menjadi {new_status}.', 'success')
+    return redirect(orders_return_url())
+
+@admin_blueprint.route('/orders/bulk-status', methods=['POST'])
+@login_required
+@karyawan_required
+@query_budget(8)
+@retry_on_lock
+def bulk_update_order_status():
+    """
+    UPDATE massal: memindahkan banyak pesanan ke satu status dalam satu transaksi.
+    Form: order_ids (boleh berulang atau dipisah koma) dan status.
+    Klien JSON (Accept: application/json) menerima hasil per ID pesanan.
+    """
+    new_status = request.form.get('status')
+    order_ids = []
+    for value in request.form.getlist('order_ids'):
+        order_ids.extend(int(part) for part in value.split(',') if part.strip().isdigit())
+    wants_json = request.accept_mimetypes.best == 'application/json'
+
+    error = None
+    if new_status not in ORDER_STATUSES:
+        error = 'Status pesanan tidak valid.'
+    elif not order_ids:
+        error = 'Pilih minimal satu pesanan.'
+    elif len(order_ids) > BULK_STATUS_MAX_ORDERS:
+        error = f'Maksimal {BULK_STATUS_MAX_ORDERS} pesanan per perubahan massal.'
+    if error:
+        if wants_json:
+            return jsonify(error=error), 400
+        flash(error, 'danger')
+        return redirect(orders_return_url())
+
+    results = bulk_update_status(order_ids, new_status)
+
+    if wants_json:
+        return jsonify(status=new_status, results={str(order_id): result for order_id, result in results.items()})
+
+    updated = [order_id for order_id, result in results.items() if result == UPDATED]
+    skipped = [f'#{order_id}' for order_id, result in results.items() if result != UPDATED]
+    if updated:
+        flash(f'{len(updated)} pesanan berhasil diubah menjadi {new_status}.', 'success')
+    if skipped:
+        flash(f'Pesanan tidak diubah (status tidak bisa dipindah atau tidak ditemukan): {", ".join(skipped)}.', 'warning')
+    return redirect(orders_return_url())
+
+@admin_blueprint.route('/metrics/database-pool')
+@login_required
+@karyawan_required
+@query_budget(1)
+def database_pool_metrics():
+    """
+    Statistik pool koneksi worker yang melayani request ini: ukuran pool, koneksi
+    yang sedang dipinjam, histogram waktu tunggu checkout dan jumlah pool habis/timeout.
+    Setiap worker gunicorn punya pool dan statistik sendiri (lihat pid).
+    """
+    return jsonify(
+        options={key: value for key, value in current_app.config['SQLALCHEMY_ENGINE_OPTIONS'].items() if key != 'poolclass'},
+        pool=pool_status(database.engine),
+        checkout=pool_metrics.snapshot()
+    )
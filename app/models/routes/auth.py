@@ -1,12 +1,18 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_user, logout_user, login_required, current_user
-from werkzeug.security import check_password_hash, generate_password_hash
 from app.extensions import database
+from app.passwords import HashingBusy, password_hasher
+from app.throttle import login_throttle
 from app.models.models.user import User
 from app.models.models.role import Role
 
 auth_blueprint = Blueprint('auth', __name__, url_prefix='/auth')
 
+def server_busy(template):
+    """Respons 503 saat antrian hashing password penuh."""
+    flash('Server sedang sibuk. Silakan coba lagi beberapa saat lagi.', 'warning')
+    return render_template(template), 503, {'Retry-After': '5'}
+
 @auth_blueprint.route('/login', methods=['GET', 'POST'])
 def login():
     """
@@ -27,15 +33,35 @@ def login():
             flash('Username dan password harus diisi.', 'danger')
             return render_template('login.html')
         
+        # Tolak percobaan berlebih sebelum query database dan hashing
+        retry_after = login_throttle.hit(request.remote_addr, username)
+        if retry_after:
+            flash(f'Terlalu banyak percobaan login. Silakan coba lagi dalam {retry_after} detik.', 'danger')
+            return render_template('login.html'), 429, {'Retry-After': str(retry_after)}
+        
         # Cari user di database
         user = User.query.filter_by(username=username).first()
         
-        # Validasi kredensial
-        if not user or not check_password_hash(user.password, password):
+        # Validasi kredensial (hashing dijalankan di thread pool terbatas)
+        try:
+            valid = user is not None and password_hasher.verify(user.password, password)
+        except HashingBusy:
+            return server_busy('login.html')
+        
+        if not valid:
             flash('Username atau password salah. Silakan coba lagi.', 'danger')
             return render_template('login.html')
         
+        # Perbarui hash lama ke work factor terbaru tanpa perlu reset password massal
+        if password_hasher.needs_rehash(user.password):
+            try:
+                user.password = password_hasher.hash(password)
+                database.session.commit()
+            except HashingBusy:
+                pass
+        
         # Login berhasil
+        login_throttle.reset_username(username)
         login_user(user, remember=remember)
         flash(f'Selamat datang, {user.full_name}! Login berhasil.', 'success')
         
@@ -93,11 +119,16 @@ def register():
         # Dapatkan role Customer
         customer_role = Role.query.filter_by(name='Customer').first()
         
+        try:
+            password_hash = password_hasher.hash(password)
+        except HashingBusy:
+            return server_busy('register.html')
+        
         # Buat user baru
         new_user = User(
             username=username,
             email=email,
-            password=generate_password_hash(password),
+            password=password_hash,
             full_name=full_name,
             phone=phone,
             role_id=customer_role.id
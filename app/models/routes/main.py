@@ -1,26 +1,68 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import current_user, login_required
 from app.extensions import database
+from app.catalog import catalog_cache
+from app.events import order_events
+from app.outbox import ORDER_CREATED, outbox
+from app.page_cache import page_cache
+from app.search import service_search
 from app.models.models.service import LaundryService
-from app.models.models.order import ServiceOrder
+from app.models.models.order import CUSTOMER_TRANSITIONS, ServiceOrder
+from app.order_numbers import order_numbers
+from app.order_status import CONFLICT, update_status
+from app.pagination import get_page_size, keyset_paginate
+from app.query_budget import query_budget
+from app.replica import read_replica
+from app.sqlite_profile import retry_on_lock
+from app.rollup import record_order_created
 from datetime import datetime
-import random
-import string
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 
 main_blueprint = Blueprint('main', __name__)
 
+ORDER_NUMBER_ATTEMPTS = 5
+
 @main_blueprint.route('/')
+@query_budget(2)
+@page_cache.public_page()
+@read_replica
 def index():
-    featured_services = LaundryService.query.filter_by(is_active=True).limit(6).all()
+    featured_services = catalog_cache.active_services()[:6]
     return render_template('index.html', featured_services=featured_services)
 
 @main_blueprint.route('/services')
+@query_budget(2)
+@page_cache.public_page()
+@read_replica
 def services():
-    all_services = LaundryService.query.filter_by(is_active=True).all()
-    return render_template('services.html', services=all_services)
+    # ?q= membuat halaman tidak di-cache (query string), hasil pencarian selalu segar
+    search = request.args.get('q', '').strip()
+    if search:
+        all_services = service_search.search(search)
+    else:
+        all_services = catalog_cache.active_services()
+    return render_template('services.html', services=all_services, search=search)
+
+@main_blueprint.route('/services/search')
+@query_budget(2)
+def search_services():
+    """Type-ahead JSON: layanan aktif yang cocok dengan awalan kata yang sedang diketik."""
+    results = service_search.search(request.args.get('q', ''), limit=8)
+    return jsonify([
+        {
+            'id': item.id,
+            'name': item.name,
+            'price': item.get_formatted_price(),
+            'unit': item.unit,
+            'url': url_for('main.order', service_id=item.id),
+        }
+        for item in results
+    ])
 
 @main_blueprint.route('/order/<int:service_id>', methods=['GET', 'POST'])
 @login_required
+@retry_on_lock
 def order(service_id):
     if current_user.is_karyawan():
         flash('Karyawan tidak dapat memesan layanan. Fitur pemesanan hanya untuk customer.', 'warning')
@@ -49,25 +91,43 @@ def order(service_id):
             return render_template('order.html', service=service)
         total_price = service.price * quantity
 
-        order_number = f"ORD-{datetime.now().strftime('%Y%m%d')}-{''.join(random.choices(string.ascii_uppercase + string.digits, k=6))}"
-
-        while ServiceOrder.query.filter_by(order_number=order_number).first():
-            order_number = f"ORD-{datetime.now().strftime('%Y%m%d')}-{''.join(random.choices(string.ascii_uppercase + string.digits, k=6))}"
-
-        new_order = ServiceOrder(
-            order_number=order_number,
-            user_id=current_user.id,
-            service_id=service.id,
-            quantity=quantity,
-            total_price=total_price,
-            notes=notes,
-            pickup_address=pickup_address,
-            delivery_address=delivery_address,
-            status='pending'
-        )
-
-        database.session.add(new_order)
-        database.session.commit()
+        # Nomor pesanan dibuat tanpa query; tabrakan yang sangat jarang ditangani dengan retry
+        for _ in range(ORDER_NUMBER_ATTEMPTS):
+            new_order = ServiceOrder(
+                order_number=order_numbers.generate(),
+                user_id=current_user.id,
+                service_id=service.id,
+                quantity=quantity,
+                total_price=total_price,
+                notes=notes,
+                pickup_address=pickup_address,
+                delivery_address=delivery_address,
+                status='pending',
+                order_date=datetime.utcnow()
+            )
+
+            database.session.add(new_order)
+            try:
+                # Rollup harian diperbarui dalam transaksi yang sama dengan pesanan
+                database.session.flush()
+                record_order_created(new_order)
+                order_events.record_created(new_order)
+                outbox.enqueue(ORDER_CREATED, {
+                    'order_id': new_order.id,
+                    'order_number': new_order.order_number,
+                    'user_id': new_order.user_id,
+                    'service_id': new_order.service_id,
+                    'quantity': new_order.quantity,
+                    'total_price': new_order.total_price,
+                    'status': new_order.status,
+                })
+                database.session.commit()
+                break
+            except IntegrityError:
+                database.session.rollback()
+        else:
+            flash('Terjadi kesalahan saat membuat pesanan. Silakan coba lagi.', 'danger')
+            return render_template('order.html', service=service)
 
         flash('Pesanan berhasil dibuat! Kami akan segera memprosesnya.', 'success')
         return redirect(url_for('main.index'))
@@ -76,16 +136,33 @@ def order(service_id):
 
 @main_blueprint.route('/orders')
 @login_required
+@query_budget(4)
+@read_replica
 def orders():
+    cursor = request.args.get('cursor')
+    page_size = get_page_size()
+
     if current_user.is_karyawan():
-        all_orders = ServiceOrder.query.order_by(ServiceOrder.order_date.desc()).all()
-        return render_template('orders.html', orders=all_orders, is_karyawan=True)
+        # Customer dan layanan dimuat per halaman dengan query IN, bukan satu query per baris
+        all_orders = ServiceOrder.query.options(
+            selectinload(ServiceOrder.customer),
+            selectinload(ServiceOrder.service)
+        )
+        page = keyset_paginate(all_orders, ServiceOrder.order_date, ServiceOrder.id, cursor, page_size)
+        return render_template('orders.html', orders=page.items, page=page, is_karyawan=True)
     else:
-        user_orders = ServiceOrder.query.filter_by(user_id=current_user.id).order_by(ServiceOrder.order_date.desc()).all()
-        return render_template('orders.html', orders=user_orders, is_karyawan=False)
+        user_orders = ServiceOrder.query.filter_by(user_id=current_user.id).options(
+            selectinload(ServiceOrder.service)
+        )
+        page = keyset_paginate(user_orders, ServiceOrder.order_date, ServiceOrder.id, cursor, page_size)
+        return render_template(
+            'orders.html', orders=page.items, page=page, is_karyawan=False,
+            customer_transitions=CUSTOMER_TRANSITIONS
+        )
 
 @main_blueprint.route('/order/cancel/<int:order_id>', methods=['POST'])
 @login_required
+@retry_on_lock
 def cancel_order(order_id):
     """
     Route untuk customer membatalkan pesanan mereka sendiri.
@@ -95,29 +172,33 @@ def cancel_order(order_id):
         flash('Karyawan tidak dapat membatalkan pesanan customer.', 'warning')
         return redirect(url_for('main.orders'))
 
-    order = ServiceOrder.query.get_or_404(order_id)
+    # Baris dikunci (Postgres/MySQL) agar pembatalan tidak balapan dengan karyawan yang memproses pesanan
+    order = ServiceOrder.query.filter_by(id=order_id).with_for_update().first_or_404()
 
     # Pastikan pesanan milik user yang sedang login
     if order.user_id != current_user.id:
         flash('Anda tidak memiliki akses untuk membatalkan pesanan ini.', 'danger')
         return redirect(url_for('main.orders'))
 
-    # Hanya bisa membatalkan pesanan yang masih pending
-    if order.status != 'pending':
+    # Customer hanya bisa membatalkan pesanan yang masih pending
+    if not order.can_change_status('cancelled', CUSTOMER_TRANSITIONS):
         flash('Pesanan yang sudah diproses tidak dapat dibatalkan.', 'warning')
         return redirect(url_for('main.orders'))
 
-    # Update status menjadi cancelled
-    order.status = 'cancelled'
-    database.session.commit()
+    # Update status menjadi cancelled, hanya jika status belum diubah request lain
+    if update_status(order, 'cancelled') == CONFLICT:
+        flash('Pesanan yang sudah diproses tidak dapat dibatalkan.', 'warning')
+        return redirect(url_for('main.orders'))
 
     flash('Pesanan berhasil dibatalkan.', 'success')
     return redirect(url_for('main.orders'))
 
 @main_blueprint.route('/about')
+@page_cache.public_page(uses_catalog=False)
 def about():
     return render_template('about.html')
 
 @main_blueprint.route('/contact')
+@page_cache.public_page(uses_catalog=False)
 def contact():
     return render_template('contact.html')
\ No newline at end of file
@@ -0,0 +1,37 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from functools import lru_cache
+
+# Nominal yang sering tampil (harga katalog, total pesanan umum) tersimpan hasil formatnya
+FORMAT_CACHE_SIZE = 4096
+
+
+def to_rupiah(value):
+    """
+    Mengubah nilai uang (int, Decimal, float, atau string angka) menjadi integer rupiah,
+    dibulatkan setengah ke atas seperti ROUND() di database.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    try:
+        return int(Decimal(str(value).strip()).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+    except (InvalidOperation, ValueError):
+        raise ValueError(f'Nominal rupiah tidak valid: {value!r}')
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def _format_integer(amount):
+    return f'{amount:,}'.replace(',', '.')
+
+
+def format_number(value):
+    """1234567 -> '1.234.567'. Nilai yang bukan angka dikembalikan apa adanya."""
+    try:
+        return _format_integer(to_rupiah(value))
+    except (ValueError, TypeError):
+        return value
+
+
+@lru_cache(maxsize=FORMAT_CACHE_SIZE)
+def format_rupiah(amount):
+    """1234567 -> 'Rp 1.234.567' (hasil di-cache per nominal)."""
+    return f'Rp {format_number(amount)}'
@@ -0,0 +1,57 @@
+import os
+import string
+import threading
+from datetime import datetime
+
+ALPHABET = string.digits + string.ascii_uppercase
+SUFFIX_LENGTH = 6
+WORKER_SLOTS = 64
+
+
+def encode_base36(value, length=SUFFIX_LENGTH):
+    """Encode angka ke base36 huruf besar dengan panjang tetap (urutan string = urutan angka)."""
+    digits = []
+    for _ in range(length):
+        value, remainder = divmod(value, 36)
+        digits.append(ALPHABET[remainder])
+    return ''.join(reversed(digits))
+
+
+class OrderNumberGenerator:
+    """
+    Membuat nomor pesanan ORD-YYYYMMDD-XXXXXX tanpa query ke database.
+    Suffix berisi waktu sejak tengah malam (resolusi 1/100 detik) dikalikan slot worker,
+    sehingga nomor selalu naik dalam satu hari dan worker berbeda tidak saling bertabrakan.
+    """
+
+    def __init__(self):
+        self.worker_id = None
+        self._lock = threading.Lock()
+        self._day = None
+        self._last_tick = -1
+
+    def init_app(self, app):
+        self.worker_id = app.config.get('ORDER_WORKER_ID')
+
+    def _worker_slot(self):
+        # PID dibaca saat generate karena gunicorn fork worker setelah create_app
+        worker_id = self.worker_id if self.worker_id is not None else os.getpid()
+        return int(worker_id) % WORKER_SLOTS
+
+    def generate(self, now=None):
+        now = now or datetime.now()
+        day = now.strftime('%Y%m%d')
+        midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        tick = int((now - midnight).total_seconds() * 100)
+
+        with self._lock:
+            if day == self._day and tick <= self._last_tick:
+                # Lebih dari satu pesanan dalam 1/100 detik: pakai tick berikutnya
+                tick = self._last_tick + 1
+            self._day = day
+            self._last_tick = tick
+
+        return f"ORD-{day}-{encode_base36(tick * WORKER_SLOTS + self._worker_slot())}"
+
+
+order_numbers = OrderNumberGenerator()
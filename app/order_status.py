@@ -0,0 +1,117 @@
+from datetime import datetime
+from sqlalchemy import func, select, update
+from app.extensions import database
+from app.events import order_events
+from app.outbox import ORDER_STATUS_CHANGED, outbox
+from app.models.models.order import COMPLETED_STATUSES, ServiceOrder, can_transition
+from app.rollup import record_bulk_status_change, record_status_change
+
+# Batas ID per request agar daftar IN tetap di bawah batas parameter SQLite
+BULK_STATUS_MAX_ORDERS = 500
+
+# Hasil per ID pesanan
+UPDATED = 'updated'
+UNCHANGED = 'unchanged'
+NOT_FOUND = 'not_found'
+INVALID_TRANSITION = 'invalid_transition'
+CONFLICT = 'conflict'
+
+
+def _status_values(new_status):
+    values = {'status': new_status}
+    if new_status in COMPLETED_STATUSES:
+        values['completed_date'] = func.coalesce(ServiceOrder.completed_date, datetime.utcnow())
+    return values
+
+
+def update_status(order, new_status):
+    """
+    Memindahkan satu pesanan yang transisinya sudah divalidasi ke new_status.
+    Status lama ikut di WHERE seperti bulk_update_status: jika request lain mengubah
+    pesanan sejak dibaca, transaksi di-rollback dan CONFLICT dikembalikan, sehingga
+    delta rollup hanya dicatat untuk perubahan yang benar-benar terjadi.
+    """
+    old_status = order.status
+    result = database.session.execute(
+        update(ServiceOrder)
+        .where(ServiceOrder.id == order.id)
+        .where(ServiceOrder.status == old_status)
+        .values(**_status_values(new_status))
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        database.session.rollback()
+        return CONFLICT
+
+    record_status_change(order, old_status, new_status)
+    order_events.record_status_changed([order.id], new_status)
+    outbox.enqueue(ORDER_STATUS_CHANGED, {'order_id': order.id, 'old_status': old_status, 'status': new_status})
+    database.session.commit()
+    return UPDATED
+
+
+def bulk_update_status(order_ids, new_status):
+    """
+    Memindahkan banyak pesanan ke new_status dalam satu transaksi, dengan satu UPDATE
+    per status lama (paling banyak dua, mis. pending dan processing ke cancelled).
+    Pesanan tidak dimuat sebagai objek ORM: hanya kolom yang dibutuhkan untuk validasi
+    transisi dan delta rollup yang dibaca. Mengembalikan dict {order_id: hasil}.
+    """
+    order_ids = list(dict.fromkeys(order_ids))
+    rows = database.session.execute(
+        select(
+            ServiceOrder.id, ServiceOrder.order_date, ServiceOrder.service_id,
+            ServiceOrder.status, ServiceOrder.quantity, ServiceOrder.total_price
+        )
+        .where(ServiceOrder.id.in_(order_ids))
+        .with_for_update()
+    ).all()
+
+    results = dict.fromkeys(order_ids, NOT_FOUND)
+    movable = []
+    for row in rows:
+        if row.status == new_status:
+            results[row.id] = UNCHANGED
+        elif can_transition(row.status, new_status):
+            movable.append(row)
+        else:
+            results[row.id] = INVALID_TRANSITION
+
+    if not movable:
+        database.session.rollback()
+        return results
+
+    values = _status_values(new_status)
+
+    # Satu UPDATE per status lama, dengan status lama itu di WHERE: baris yang sudah diubah
+    # request lain (termasuk ke status lain yang juga ada di daftar) tidak tersentuh
+    groups = {}
+    for row in movable:
+        groups.setdefault(row.status, []).append(row.id)
+    for old_status, group_ids in groups.items():
+        result = database.session.execute(
+            update(ServiceOrder)
+            .where(ServiceOrder.id.in_(group_ids))
+            .where(ServiceOrder.status == old_status)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(group_ids):
+            # Sebagian pesanan berubah di tengah transaksi: batalkan semuanya, coba lagi dari halaman terbaru
+            database.session.rollback()
+            results.update(dict.fromkeys((row.id for row in movable), CONFLICT))
+            return results
+
+    record_bulk_status_change(
+        [(row.order_date, row.service_id, row.status, row.quantity, row.total_price) for row in movable],
+        new_status
+    )
+    order_events.record_status_changed([row.id for row in movable], new_status)
+    outbox.enqueue_many(ORDER_STATUS_CHANGED, [
+        {'order_id': row.id, 'old_status': row.status, 'status': new_status} for row in movable
+    ])
+    database.session.commit()
+
+    for row in movable:
+        results[row.id] = UPDATED
+    return results
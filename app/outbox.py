@@ -0,0 +1,286 @@
+import json
+import logging
+import random
+import threading
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import delete, event, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.extensions import database
+from app.models.models.outbox import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+ORDER_CREATED = 'order.created'
+ORDER_STATUS_CHANGED = 'order.status_changed'
+
+PENDING = 'pending'
+DONE = 'done'
+DEAD = 'dead'
+
+# Penanda di session.info: transaksi ini menulis outbox, bangunkan dispatcher setelah commit
+PENDING_OUTBOX_KEY = 'outbox_pending'
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class Outbox:
+    """
+    Transactional outbox untuk efek samping pesanan.
+    enqueue() hanya menambah baris ke transaksi yang sedang berjalan, jadi request
+    POST pesanan tidak pernah menunggu sistem lain. Dispatcher (thread di setiap
+    worker web dan/atau `flask outbox run`) mengklaim pesan per batch dengan lease,
+    menjalankan handler per topik, dan menjadwalkan ulang pesan yang gagal dengan
+    exponential backoff. Pesan bisa terkirim lebih dari sekali (at-least-once),
+    handler memakai id pesan sebagai idempotency key.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.handlers = {}
+        self.mode = 'off'
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._executor = None
+        self._last_prune = 0.0
+
+    def init_app(self, app):
+        self.app = app
+        self.mode = app.config['OUTBOX_DISPATCHER']
+        self.handlers = {}
+        if app.config['OUTBOX_WEBHOOK_URL']:
+            for topic in (ORDER_CREATED, ORDER_STATUS_CHANGED):
+                self.register(topic, post_webhook)
+
+        if self.mode == 'thread':
+            # Mulai saat request pertama (setelah fork gunicorn), sisa pesan dari restart ikut terkirim
+            app.before_request(self._ensure_thread)
+
+    def register(self, topic, handler):
+        """handler(message_id, topic, payload) dijalankan di luar transaksi request; exception = retry."""
+        self.handlers.setdefault(topic, []).append(handler)
+
+    def handler(self, topic):
+        def decorator(function):
+            self.register(topic, function)
+            return function
+        return decorator
+
+    # --- Sisi penulis (dalam transaksi perubahan pesanan) ---
+
+    def enqueue(self, topic, payload):
+        self.enqueue_many(topic, [payload])
+
+    def enqueue_many(self, topic, payloads):
+        now = datetime.utcnow()
+        rows = [
+            {
+                'topic': topic,
+                'payload': json.dumps(payload, default=_json_default),
+                'status': PENDING,
+                'attempts': 0,
+                'created_at': now,
+                'available_at': now,
+            }
+            for payload in payloads
+        ]
+        if not rows:
+            return
+        database.session.execute(insert(OutboxMessage), rows)
+        database.session.info[PENDING_OUTBOX_KEY] = True
+
+    def wake(self):
+        if self.mode == 'thread':
+            self._ensure_thread()
+            self._wakeup.set()
+
+    # --- Dispatcher ---
+
+    def claim_batch(self, batch_size=None):
+        """
+        Mengklaim pesan yang jatuh tempo dengan satu UPDATE bersyarat (aman untuk banyak
+        dispatcher sekaligus, juga di SQLite yang tidak punya SKIP LOCKED).
+        Mengembalikan daftar (id, topic, payload, attempts).
+        """
+        config = self.app.config
+        batch_size = batch_size or config['OUTBOX_BATCH_SIZE']
+        now = datetime.utcnow()
+        claimable = (
+            (OutboxMessage.status == PENDING)
+            & (OutboxMessage.available_at <= now)
+            & or_(OutboxMessage.locked_until.is_(None), OutboxMessage.locked_until < now)
+        )
+        # SKIP LOCKED (Postgres/MySQL) agar dispatcher paralel tidak saling menunggu; diabaikan di SQLite
+        candidate_ids = database.session.execute(
+            select(OutboxMessage.id)
+            .where(claimable)
+            .order_by(OutboxMessage.available_at, OutboxMessage.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).scalars().all()
+        if not candidate_ids:
+            database.session.rollback()
+            return []
+
+        token = str(uuid.uuid4())
+        database.session.execute(
+            update(OutboxMessage)
+            .where(OutboxMessage.id.in_(candidate_ids))
+            .where(claimable)
+            .values(lease_token=token, locked_until=now + timedelta(seconds=config['OUTBOX_LEASE_SECONDS']))
+            .execution_options(synchronize_session=False)
+        )
+        database.session.commit()
+
+        return database.session.execute(
+            select(OutboxMessage.id, OutboxMessage.topic, OutboxMessage.payload, OutboxMessage.attempts)
+            .where(OutboxMessage.lease_token == token)
+            .order_by(OutboxMessage.id)
+        ).all()
+
+    def _deliver(self, message):
+        """Dijalankan di thread pool, tanpa session database; mengembalikan pesan error atau None."""
+        message_id, topic, payload, _ = message
+        try:
+            for handler in self.handlers.get(topic, ()):
+                handler(message_id, topic, json.loads(payload))
+        except Exception as error:
+            logger.warning(f'Outbox #{message_id} ({topic}) gagal: {error}')
+            return f'{type(error).__name__}: {error}'[:1000]
+        return None
+
+    def backoff(self, attempts):
+        """Exponential backoff dengan jitter: base * 2^(attempts-1), dibatasi OUTBOX_BACKOFF_MAX."""
+        config = self.app.config
+        delay = min(config['OUTBOX_BACKOFF_BASE'] * 2 ** (attempts - 1), config['OUTBOX_BACKOFF_MAX'])
+        return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+    def dispatch_batch(self, batch_size=None):
+        """Satu putaran: klaim, kirim paralel, catat hasil. Mengembalikan jumlah pesan yang diproses."""
+        messages = self.claim_batch(batch_size)
+        if not messages:
+            return 0
+
+        errors = list(self._get_executor().map(self._deliver, messages))
+
+        now = datetime.utcnow()
+        delivered = [message.id for message, error in zip(messages, errors) if error is None]
+        if delivered:
+            database.session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(delivered))
+                .values(status=DONE, dispatched_at=now, lease_token=None, locked_until=None, last_error=None)
+                .execution_options(synchronize_session=False)
+            )
+        max_attempts = self.app.config['OUTBOX_MAX_ATTEMPTS']
+        for message, error in zip(messages, errors):
+            if error is None:
+                continue
+            attempts = message.attempts + 1
+            database.session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id == message.id)
+                .values(
+                    status=DEAD if attempts >= max_attempts else PENDING,
+                    attempts=attempts,
+                    last_error=error,
+                    available_at=now + self.backoff(attempts),
+                    lease_token=None,
+                    locked_until=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        database.session.commit()
+        return len(messages)
+
+    def drain(self, batch_size=None):
+        """Mengirim semua pesan yang sudah jatuh tempo; mengembalikan jumlah total yang diproses."""
+        total = 0
+        while True:
+            processed = self.dispatch_batch(batch_size)
+            total += processed
+            if processed < (batch_size or self.app.config['OUTBOX_BATCH_SIZE']):
+                self._prune()
+                return total
+
+    def _prune(self):
+        if time.monotonic() - self._last_prune < 3600:
+            return
+        self._last_prune = time.monotonic()
+        cutoff = datetime.utcnow() - timedelta(days=self.app.config['OUTBOX_RETENTION_DAYS'])
+        database.session.execute(
+            delete(OutboxMessage).where(OutboxMessage.status == DONE, OutboxMessage.dispatched_at < cutoff)
+        )
+        database.session.commit()
+
+    def run_forever(self, stop_event=None):
+        """Loop dispatcher untuk thread in-app maupun `flask outbox run`."""
+        stop_event = stop_event or threading.Event()
+        poll_interval = self.app.config['OUTBOX_POLL_INTERVAL']
+        while not stop_event.is_set():
+            try:
+                with self.app.app_context():
+                    self.drain()
+            except Exception:
+                logger.exception('Dispatcher outbox gagal memproses batch')
+            self._wakeup.wait(poll_interval)
+            self._wakeup.clear()
+
+    def counts(self):
+        return dict(database.session.execute(
+            select(OutboxMessage.status, func.count(OutboxMessage.id)).group_by(OutboxMessage.status)
+        ).all())
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.app.config['OUTBOX_WORKERS'], thread_name_prefix='outbox'
+            )
+        return self._executor
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run_forever, name='outbox-dispatcher', daemon=True)
+                self._thread.start()
+
+
+def post_webhook(message_id, topic, payload):
+    """Handler bawaan: POST JSON ke OUTBOX_WEBHOOK_URL; status non-2xx atau timeout = retry."""
+    config = outbox.app.config
+    body = json.dumps({'id': message_id, 'topic': topic, 'payload': payload}).encode()
+    request = urllib.request.Request(
+        config['OUTBOX_WEBHOOK_URL'],
+        data=body,
+        method='POST',
+        headers={
+            'Content-Type': 'application/json',
+            'Idempotency-Key': f'outbox-{message_id}',
+        }
+    )
+    with urllib.request.urlopen(request, timeout=config['OUTBOX_WEBHOOK_TIMEOUT']) as response:
+        response.read()
+
+
+outbox = Outbox()
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_dispatcher_after_commit(session):
+    if session.info.pop(PENDING_OUTBOX_KEY, False):
+        outbox.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_outbox(session):
+    session.info.pop(PENDING_OUTBOX_KEY, None)
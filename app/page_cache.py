@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+from datetime import datetime, timezone
+from functools import wraps
+from flask import make_response, request, session
+from flask_login import current_user
+from app.catalog import catalog_cache
+
+
+class PageCache:
+    """
+    Cache output HTML halaman publik untuk pengunjung anonim.
+    Key cache adalah endpoint + versi katalog, sehingga perubahan layanan
+    oleh admin otomatis membuat halaman dirender ulang di semua worker.
+    """
+
+    def __init__(self, maxsize=64):
+        self.maxsize = maxsize
+        self.enabled = True
+        self.templates_modified = None
+        self._pages = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.enabled = app.config['PAGE_CACHE_ENABLED']
+        self.templates_modified = self._templates_modified(app)
+        self.clear()
+
+    def _templates_modified(self, app):
+        # Template berubah saat deploy; waktunya ikut menentukan ETag dan Last-Modified
+        latest = 0
+        for root, _, files in os.walk(os.path.join(app.root_path, app.template_folder)):
+            for name in files:
+                latest = max(latest, os.stat(os.path.join(root, name)).st_mtime)
+        return datetime.fromtimestamp(int(latest), tz=timezone.utc)
+
+    def get(self, key):
+        return self._pages.get(key)
+
+    def put(self, key, body):
+        with self._lock:
+            if len(self._pages) >= self.maxsize:
+                self._pages.clear()
+            self._pages[key] = body
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def is_cacheable(self):
+        """Hanya GET anonim tanpa query string dan tanpa flash message yang tertunda."""
+        return (
+            self.enabled
+            and request.method in ('GET', 'HEAD')
+            and not request.query_string
+            and '_flashes' not in session
+            and not current_user.is_authenticated
+        )
+
+    def public_page(self, uses_catalog=True):
+        """
+        Decorator untuk halaman publik: ETag/Last-Modified, respons 304, dan cache hasil render.
+        Halaman statis (uses_catalog=False) hanya bergantung pada template.
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not self.is_cacheable():
+                    return view(*args, **kwargs)
+
+                last_modified = self.templates_modified
+                version = 0
+                if uses_catalog:
+                    snapshot = catalog_cache.snapshot()
+                    version = snapshot.version
+                    if snapshot.last_modified:
+                        last_modified = max(
+                            last_modified,
+                            snapshot.last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+                        )
+
+                etag = hashlib.sha1(
+                    f'{request.endpoint}:{version}:{last_modified.isoformat()}'.encode()
+                ).hexdigest()
+
+                # Klien sudah punya versi terbaru: tidak perlu render maupun query
+                if request.if_none_match.contains(etag):
+                    response = make_response('', 304)
+                    response.set_etag(etag)
+                    return response
+
+                key = (request.endpoint, version)
+                body = self.get(key)
+                if body is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    body = response.get_data()
+                    self.put(key, body)
+
+                response = make_response(body)
+                response.set_etag(etag)
+                response.last_modified = last_modified
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+            return wrapper
+        return decorator
+
+
+page_cache = PageCache()
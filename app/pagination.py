@@ -0,0 +1,93 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from flask import current_app, request, url_for
+from sqlalchemy import and_, or_
+
+
+@dataclass
+class KeysetPage:
+    """Satu halaman hasil keyset pagination."""
+    items: list
+    page_size: int
+    next_cursor: Optional[str] = None
+    is_first: bool = True
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+def encode_cursor(sort_value, row_id):
+    """Cursor opaque (base64) dari nilai kolom sort terakhir dan id-nya."""
+    if isinstance(sort_value, datetime):
+        sort_value = {'dt': sort_value.isoformat()}
+    payload = json.dumps([sort_value, row_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Kebalikan encode_cursor; cursor rusak dianggap halaman pertama (None)."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value['dt'])
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def get_page_size(default_key='ORDERS_PAGE_SIZE'):
+    """Ukuran halaman dari ?per_page=, dibatasi PAGE_SIZE_MAX."""
+    page_size = request.args.get('per_page', type=int) or current_app.config[default_key]
+    return max(1, min(page_size, current_app.config['PAGE_SIZE_MAX']))
+
+
+def keyset_paginate(query, sort_column, id_column, cursor, page_size, key=None, descending=True):
+    """
+    Keyset pagination pada (sort_column, id_column), menurun secara default
+    (descending=False untuk urutan terlama dulu, misalnya antrian kerja).
+    Hanya mengambil page_size + 1 baris, jadi halaman jauh tetap O(ukuran halaman)
+    selama ada index pada kedua kolom tersebut.
+    key(item) mengembalikan (nilai sort, id) dari item terakhir untuk cursor berikutnya.
+    """
+    position = decode_cursor(cursor)
+    if position is not None:
+        sort_value, last_id = position
+        if descending:
+            query = query.filter(or_(
+                sort_column < sort_value,
+                and_(sort_column == sort_value, id_column < last_id)
+            ))
+        else:
+            query = query.filter(or_(
+                sort_column > sort_value,
+                and_(sort_column == sort_value, id_column > last_id)
+            ))
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+    rows = query.limit(page_size + 1).all()
+    items = rows[:page_size]
+    next_cursor = None
+    if len(rows) > page_size:
+        key = key or (lambda item: (getattr(item, sort_column.key), getattr(item, id_column.key)))
+        next_cursor = encode_cursor(*key(items[-1]))
+
+    return KeysetPage(items=items, page_size=page_size, next_cursor=next_cursor, is_first=position is None)
+
+
+def page_url(cursor=None):
+    """URL halaman lain dari endpoint yang sama dengan query string (filter) yang dipertahankan."""
+    args = request.args.to_dict()
+    args.pop('cursor', None)
+    if cursor:
+        args['cursor'] = cursor
+    return url_for(request.endpoint, **(request.view_args or {}), **args)
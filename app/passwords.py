@@ -0,0 +1,92 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from werkzeug.security import check_password_hash, generate_password_hash
+
+try:
+    from gevent.monkey import is_module_patched
+    from gevent.threadpool import ThreadPoolExecutor as NativeThreadPoolExecutor
+except ImportError:  # gevent hanya dipakai worker gunicorn gevent
+    is_module_patched = None
+
+
+class HashingBusy(Exception):
+    """Antrian hashing password penuh; request sebaiknya dijawab 503."""
+
+
+class PasswordHasher:
+    """
+    Menjalankan hashing dan verifikasi password di thread pool terbatas.
+    hashlib melepas GIL selama PBKDF2/scrypt, sehingga request lain tetap berjalan,
+    dan jumlah pekerjaan yang boleh mengantri dibatasi agar lonjakan login tidak menumpuk.
+    """
+
+    def __init__(self):
+        self.method = 'scrypt'
+        self.workers = 2
+        self.queue_size = 8
+        self.timeout = 10
+        self._executor = None
+        self._slots = None
+        self._method_prefix = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.queue_size = app.config['PASSWORD_HASH_QUEUE_SIZE']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._executor = None
+        self._slots = None
+        self._method_prefix = None
+
+    def _get_executor(self):
+        # Dibuat saat pertama dipakai, yaitu setelah gunicorn fork worker (dan patch gevent)
+        with self._lock:
+            if self._executor is None:
+                # Di worker gevent thread biasa menjadi greenlet dan hashing akan memblokir
+                # seluruh worker; pool gevent memakai thread OS asli
+                patched = is_module_patched is not None and is_module_patched('threading')
+                executor_class = NativeThreadPoolExecutor if patched else ThreadPoolExecutor
+                self._executor = executor_class(
+                    max_workers=self.workers,
+                    thread_name_prefix='password-hash'
+                )
+                self._slots = threading.BoundedSemaphore(self.workers + self.queue_size)
+            return self._executor
+
+    def _run(self, function, *args, **kwargs):
+        executor = self._get_executor()
+        if not self._slots.acquire(blocking=False):
+            raise HashingBusy()
+
+        try:
+            future = executor.submit(function, *args, **kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+
+    def hash(self, password):
+        """Membuat hash password dengan work factor yang dikonfigurasi."""
+        return self._run(generate_password_hash, password, method=self.method)
+
+    def verify(self, password_hash, password):
+        """Verifikasi password terhadap hash yang tersimpan."""
+        return self._run(check_password_hash, password_hash, password)
+
+    def method_prefix(self):
+        """Prefix hash (mis. 'scrypt:32768:8:1') untuk method yang sedang dikonfigurasi."""
+        if self._method_prefix is None:
+            self._method_prefix = generate_password_hash('', method=self.method).split('$', 1)[0]
+        return self._method_prefix
+
+    def needs_rehash(self, password_hash):
+        """True jika hash tersimpan dibuat dengan method/cost yang berbeda dari konfigurasi."""
+        return password_hash.split('$', 1)[0] != self.method_prefix()
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,97 @@
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryBudgetExceeded(Exception):
+    """Route menjalankan lebih banyak query SQL dari budget yang dideklarasikan."""
+
+
+class QueryCounter:
+    """Menghitung statement SQL yang dieksekusi oleh semua engine selama blok with."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        event.listen(Engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(Engine, 'before_cursor_execute', self)
+
+
+def query_budget(limit):
+    """
+    Mendeklarasikan jumlah maksimum query SQL untuk satu request ke route ini.
+    Dicek saat QUERY_BUDGET_MODE bernilai 'warn' atau 'raise' (tes dan benchmark).
+    """
+    def decorator(function):
+        function.query_budget = limit
+        return function
+    return decorator
+
+
+def stream_within_budget(chunks):
+    """
+    Membungkus generator respons streaming (di dalam stream_with_context) agar query yang
+    dijalankan generator ikut dihitung: generator baru berjalan setelah after_request,
+    jadi budget route dicek setelah potongan terakhir terkirim.
+    """
+    if current_app.config['QUERY_BUDGET_MODE'] == 'off' or 'query_count' not in g:
+        return chunks
+    g.query_budget_streaming = True
+
+    def generator():
+        yield from chunks
+        _enforce_budget(g.pop('query_count'))
+    return generator()
+
+
+def _enforce_budget(count):
+    view = current_app.view_functions.get(request.endpoint)
+    limit = getattr(view, 'query_budget', None)
+    if limit is not None and count > limit:
+        message = f'{request.endpoint} menjalankan {count} query (budget {limit})'
+        if current_app.config['QUERY_BUDGET_MODE'] == 'raise':
+            raise QueryBudgetExceeded(message)
+        current_app.logger.warning(message)
+
+
+def _count_request_query(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+
+
+def init_query_budget(app):
+    """
+    Mode instrumentasi: 'off' (default), 'warn' (log), atau 'raise' (request gagal).
+    Jumlah query per request juga dikirim lewat header X-Query-Count.
+    """
+    mode = app.config['QUERY_BUDGET_MODE']
+    if mode == 'off':
+        return
+
+    if not event.contains(Engine, 'before_cursor_execute', _count_request_query):
+        event.listen(Engine, 'before_cursor_execute', _count_request_query)
+
+    @app.before_request
+    def start_query_count():
+        g.query_count = 0
+
+    @app.after_request
+    def check_query_budget(response):
+        # Respons streaming dicek oleh stream_within_budget() setelah generator selesai
+        if g.pop('query_budget_streaming', False):
+            return response
+        # pop: respons error 500 dari exception di bawah tidak dicek ulang
+        count = g.pop('query_count', None)
+        if count is None:
+            return response
+        response.headers['X-Query-Count'] = str(count)
+        _enforce_budget(count)
+        return response
@@ -0,0 +1,91 @@
+import time
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, has_request_context, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+# Bind key engine replica di SQLALCHEMY_BINDS
+REPLICA_BIND_KEY = 'replica'
+
+# Key di cookie session: sampai kapan (epoch detik) browser ini membaca dari primary
+STICKY_SESSION_KEY = '_primary_until'
+
+
+class ReplicaRouting:
+    """
+    Routing baca ke read replica untuk route yang ditandai @read_replica.
+    Hanya SELECT biasa (tanpa FOR UPDATE) yang dikirim ke replica; flush, INSERT/
+    UPDATE/DELETE dan statement teks tetap ke primary. Setelah sebuah request menulis,
+    browser yang sama membaca dari primary selama READ_REPLICA_STICKY_SECONDS
+    (mis. halaman tujuan redirect setelah membuat pesanan), sehingga perubahannya
+    sendiri langsung terlihat meskipun replica tertinggal.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.sticky_seconds = 0
+
+    def init_app(self, app):
+        self.enabled = bool(app.config['DATABASE_REPLICA_URL'])
+        self.sticky_seconds = app.config['READ_REPLICA_STICKY_SECONDS']
+        if self.enabled:
+            app.after_request(self._stick_to_primary_after_write)
+
+    def should_use_replica(self):
+        if not self.enabled or not has_request_context():
+            return False
+        if not g.get('read_replica') or g.get('database_wrote') or g.get('force_primary'):
+            return False
+        return session.get(STICKY_SESSION_KEY, 0) <= time.time()
+
+    def mark_write(self):
+        if has_request_context():
+            g.database_wrote = True
+
+    @contextmanager
+    def primary(self):
+        """Membaca dari primary di dalam route replica (mis. data yang di-cache lintas request)."""
+        if not has_request_context():
+            yield
+            return
+        previous = g.get('force_primary', False)
+        g.force_primary = True
+        try:
+            yield
+        finally:
+            g.force_primary = previous
+
+    def _stick_to_primary_after_write(self, response):
+        if g.get('database_wrote'):
+            session[STICKY_SESSION_KEY] = time.time() + self.sticky_seconds
+        return response
+
+
+replica_routing = ReplicaRouting()
+
+
+def read_replica(view):
+    """Menandai route yang hanya membaca: SELECT-nya boleh dilayani read replica."""
+    @wraps(view)
+    def decorated_function(*args, **kwargs):
+        g.read_replica = True
+        return view(*args, **kwargs)
+    return decorated_function
+
+
+def _is_write(clause):
+    return isinstance(clause, UpdateBase) or getattr(clause, '_for_update_arg', None) is not None
+
+
+class RoutingSession(Session):
+    """Session Flask-SQLAlchemy yang memilih engine replica untuk SELECT di route @read_replica."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or _is_write(clause):
+                replica_routing.mark_write()
+            elif isinstance(clause, Select) and replica_routing.should_use_replica():
+                return self._db.engines[REPLICA_BIND_KEY]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
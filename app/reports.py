@@ -0,0 +1,52 @@
+from sqlalchemy import func, select
+from app.extensions import database
+from app.models.models.order import COMPLETED_STATUSES
+from app.models.models.service import LaundryService
+from app.models.models.user import User
+from app.rollup import rollup_status_summary
+
+
+def order_status_summary(start_day=None, end_day=None):
+    """
+    Jumlah pesanan dan total pendapatan per status, dibaca dari tabel rollup harian.
+    Mengembalikan dict status -> (jumlah, pendapatan).
+    """
+    return rollup_status_summary(start_day, end_day)
+
+
+def catalog_and_user_counts():
+    """Total layanan, layanan aktif, dan total user dalam satu query (scalar subquery)."""
+    return database.session.execute(select(
+        select(func.count(LaundryService.id)).scalar_subquery(),
+        select(func.count(LaundryService.id)).where(LaundryService.is_active.is_(True)).scalar_subquery(),
+        select(func.count(User.id)).scalar_subquery()
+    )).one()
+
+
+def dashboard_stats():
+    """
+    Statistik dashboard admin: dua query agregat kecil (rollup + jumlah katalog/user),
+    tanpa memindai tabel service_orders.
+    """
+    total_services, active_services, total_users = catalog_and_user_counts()
+    summary = order_status_summary()
+
+    def count(*statuses):
+        return sum(summary.get(status, (0, 0))[0] for status in statuses)
+
+    def revenue(*statuses):
+        return sum(summary.get(status, (0, 0))[1] for status in statuses)
+
+    return {
+        'total_services': total_services,
+        'active_services': active_services,
+        'total_users': total_users,
+        'total_orders': sum(order_count for order_count, _ in summary.values()),
+        'total_revenue': sum(order_revenue for _, order_revenue in summary.values()),
+        'pending_orders': count('pending'),
+        'processing_orders': count('processing'),
+        'completed_orders': count(*COMPLETED_STATUSES),
+        'pending_revenue': revenue('pending'),
+        'processing_revenue': revenue('processing'),
+        'completed_revenue': revenue(*COMPLETED_STATUSES)
+    }
@@ -0,0 +1,215 @@
+from collections import defaultdict
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import database
+from app.models.models.order import ServiceOrder, normalize_status
+from app.models.models.rollup import OrderDailyRollup, OrderStatusTotal
+
+ROLLUP_KEYS = ('day', 'service_id', 'status')
+ROLLUP_MEASURES = ('order_count', 'quantity', 'revenue')
+TOTAL_KEYS = ('status',)
+
+
+def _upsert(model, keys, rows):
+    """INSERT ... ON CONFLICT yang menambahkan delta ke baris rollup yang sudah ada."""
+    table = model.__table__
+    dialect = database.session.get_bind().dialect.name
+
+    if dialect in ('sqlite', 'postgresql'):
+        statement = (sqlite_insert if dialect == 'sqlite' else postgresql_insert)(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(keys),
+            set_={name: table.c[name] + statement.excluded[name] for name in ROLLUP_MEASURES}
+        )
+    elif dialect == 'mysql':
+        statement = mysql_insert(table)
+        statement = statement.on_duplicate_key_update(
+            {name: table.c[name] + statement.inserted[name] for name in ROLLUP_MEASURES}
+        )
+    else:
+        for row in rows:
+            _apply_without_upsert(model, keys, row)
+        return
+
+    database.session.execute(statement, rows)
+
+
+def _apply_without_upsert(model, keys, row):
+    rollup = database.session.get(model, tuple(row[key] for key in keys))
+    if rollup is None:
+        database.session.add(model(**row))
+        database.session.flush()
+        return
+    for name in ROLLUP_MEASURES:
+        setattr(rollup, name, getattr(rollup, name) + row[name])
+
+
+def apply_deltas(deltas):
+    """
+    Menerapkan perubahan rollup harian dan total per status dalam transaksi session
+    yang sedang berjalan.
+    deltas: iterable (day, service_id, status, order_count, quantity, revenue).
+    Delta dengan key yang sama digabung dulu agar cukup satu statement per tabel.
+    """
+    merged = defaultdict(lambda: [0, 0, 0])
+    merged_by_status = defaultdict(lambda: [0, 0, 0])
+    for day, service_id, status, order_count, quantity, revenue in deltas:
+        status = normalize_status(status)
+        for totals in (merged[(day, service_id, status)], merged_by_status[(status,)]):
+            totals[0] += order_count
+            totals[1] += quantity
+            totals[2] += revenue
+
+    for model, keys, grouped in (
+        (OrderDailyRollup, ROLLUP_KEYS, merged),
+        (OrderStatusTotal, TOTAL_KEYS, merged_by_status),
+    ):
+        rows = [
+            dict(zip(keys, key), order_count=totals[0], quantity=totals[1], revenue=totals[2])
+            for key, totals in grouped.items()
+            if any(totals)
+        ]
+        if rows:
+            _upsert(model, keys, rows)
+
+
+def record_order_created(order):
+    """Dipanggil sebelum commit pesanan baru (order_date harus sudah terisi)."""
+    apply_deltas([
+        (order.order_date.date(), order.service_id, order.status, 1, order.quantity, order.total_price)
+    ])
+
+
+def record_status_change(order, old_status, new_status):
+    """Memindahkan satu pesanan dari bucket status lama ke status baru."""
+    if normalize_status(old_status) == normalize_status(new_status):
+        return
+    day = order.order_date.date()
+    apply_deltas([
+        (day, order.service_id, old_status, -1, -order.quantity, -order.total_price),
+        (day, order.service_id, new_status, 1, order.quantity, order.total_price),
+    ])
+
+
+def record_bulk_status_change(rows, new_status):
+    """
+    Versi set-based record_status_change untuk banyak pesanan sekaligus.
+    rows: iterable (order_date, service_id, status lama, quantity, total_price).
+    """
+    deltas = []
+    for order_date, service_id, old_status, quantity, total_price in rows:
+        if normalize_status(old_status) == normalize_status(new_status):
+            continue
+        day = order_date.date()
+        deltas.append((day, service_id, old_status, -1, -quantity, -total_price))
+        deltas.append((day, service_id, new_status, 1, quantity, total_price))
+    apply_deltas(deltas)
+
+
+def _aggregate_orders_query():
+    status = ServiceOrder.status
+    day = func.date(ServiceOrder.order_date)
+    return (
+        select(
+            day, ServiceOrder.service_id, status,
+            func.count(ServiceOrder.id),
+            func.coalesce(func.sum(ServiceOrder.quantity), 0),
+            func.coalesce(func.sum(ServiceOrder.total_price), 0)
+        )
+        .group_by(day, ServiceOrder.service_id, status)
+    )
+
+
+def _aggregate_rollup_query():
+    return (
+        select(
+            OrderDailyRollup.status,
+            func.sum(OrderDailyRollup.order_count),
+            func.coalesce(func.sum(OrderDailyRollup.quantity), 0),
+            func.coalesce(func.sum(OrderDailyRollup.revenue), 0)
+        )
+        .group_by(OrderDailyRollup.status)
+    )
+
+
+def rebuild_rollup():
+    """
+    Menghitung ulang seluruh tabel rollup dari service_orders, lalu total per status
+    dari rollup harian, dalam satu transaksi.
+    """
+    table = OrderDailyRollup.__table__
+    totals_table = OrderStatusTotal.__table__
+    database.session.execute(delete(table))
+    database.session.execute(delete(totals_table))
+    database.session.execute(
+        insert(table).from_select(list(ROLLUP_KEYS + ROLLUP_MEASURES), _aggregate_orders_query())
+    )
+    database.session.execute(
+        insert(totals_table).from_select(list(TOTAL_KEYS + ROLLUP_MEASURES), _aggregate_rollup_query())
+    )
+    database.session.commit()
+    return database.session.execute(select(func.count()).select_from(table)).scalar()
+
+
+def verify_rollup():
+    """
+    Membandingkan isi rollup dengan agregasi langsung dari service_orders.
+    Mengembalikan daftar key (day, service_id, status) yang berbeda; selisih total
+    per status dilaporkan dengan day 'total' dan service_id None.
+    """
+    def normalize(rows):
+        result = {}
+        for day, service_id, status, order_count, quantity, revenue in rows:
+            if order_count:
+                result[(str(day), service_id, status)] = (order_count, int(quantity), int(revenue))
+        return result
+
+    def totals(rows):
+        return [('total', None, status, *measures) for status, *measures in rows]
+
+    expected = normalize(database.session.execute(_aggregate_orders_query()).all())
+    actual = normalize(database.session.execute(
+        select(*(OrderDailyRollup.__table__.c[name] for name in ROLLUP_KEYS + ROLLUP_MEASURES))
+    ).all())
+    mismatches = sorted(key for key in expected.keys() | actual.keys() if expected.get(key) != actual.get(key))
+
+    expected_totals = normalize(totals(database.session.execute(
+        select(ServiceOrder.status, func.count(ServiceOrder.id),
+               func.coalesce(func.sum(ServiceOrder.quantity), 0),
+               func.coalesce(func.sum(ServiceOrder.total_price), 0))
+        .group_by(ServiceOrder.status)
+    ).all()))
+    actual_totals = normalize(totals(database.session.execute(
+        select(*(OrderStatusTotal.__table__.c[name] for name in TOTAL_KEYS + ROLLUP_MEASURES))
+    ).all()))
+    return mismatches + sorted(
+        key for key in expected_totals.keys() | actual_totals.keys()
+        if expected_totals.get(key) != actual_totals.get(key)
+    )
+
+
+def rollup_status_summary(start_day=None, end_day=None):
+    """
+    Jumlah pesanan dan pendapatan per status, opsional dibatasi rentang tanggal.
+    Tanpa rentang tanggal dibaca dari total berjalan (satu baris per status); dengan
+    rentang tanggal biayanya bergantung pada jumlah hari di rentang itu.
+    """
+    if start_day is None and end_day is None:
+        rows = database.session.execute(
+            select(OrderStatusTotal.status, OrderStatusTotal.order_count, OrderStatusTotal.revenue)
+        ).all()
+        return {status: (int(order_count), int(revenue)) for status, order_count, revenue in rows if order_count}
+
+    query = select(
+        OrderDailyRollup.status,
+        func.sum(OrderDailyRollup.order_count),
+        func.coalesce(func.sum(OrderDailyRollup.revenue), 0)
+    ).group_by(OrderDailyRollup.status)
+    if start_day is not None:
+        query = query.where(OrderDailyRollup.day >= start_day)
+    if end_day is not None:
+        query = query.where(OrderDailyRollup.day <= end_day)
+    # SUM(bigint) di Postgres bertipe numeric: dikembalikan ke int rupiah
+    return {row[0]: (int(row[1]), int(row[2])) for row in database.session.execute(query).all() if row[1]}
@@ -0,0 +1,260 @@
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from flask import current_app
+from sqlalchemy import text
+from sqlalchemy.exc import DatabaseError, OperationalError
+from app.catalog import catalog_cache
+from app.extensions import database
+from app.filters import prefix_upper_bound
+
+# Tabel FTS5 (SQLite) berisi salinan nama dan deskripsi layanan; rowid = id layanan
+FTS_TABLE = 'laundry_services_fts'
+
+# Pembungkus IMMUTABLE untuk unaccent() (Postgres): unaccent() sendiri STABLE sehingga tidak
+# bisa dipakai di ekspresi index
+UNACCENT_FUNCTION = 'service_search_unaccent'
+
+# Dokumen tsvector (Postgres): nama berbobot A, deskripsi berbobot B; dipakai oleh index GIN dan query.
+# Diakritik dibuang seperti normalize() di sisi query, jadi 'cuci' cocok dengan 'cúci'
+TSVECTOR_SQL = (
+    f"setweight(to_tsvector('simple', {UNACCENT_FUNCTION}(coalesce(name, ''))), 'A') || "
+    f"setweight(to_tsvector('simple', {UNACCENT_FUNCTION}(coalesce(description, ''))), 'B')"
+)
+
+# Bobot kecocokan di nama dibanding di deskripsi (FTS5 bm25 dan index Python)
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+MAX_TERMS = 8
+
+
+def normalize(value):
+    """Huruf kecil tanpa diakritik, sama seperti tokenizer unicode61 remove_diacritics."""
+    value = unicodedata.normalize('NFKD', (value or '').lower())
+    return ''.join(char for char in value if not unicodedata.combining(char))
+
+
+def tokenize(value):
+    return re.findall(r'\w+', normalize(value))
+
+
+class PythonSearchIndex:
+    """
+    Inverted index in-memory dari snapshot katalog: fallback untuk database tanpa
+    FTS (MySQL, SQLite tanpa FTS5) dan untuk tes. Prefix dicari dengan bisect
+    pada daftar token yang terurut.
+    """
+
+    def __init__(self, items):
+        self.postings = defaultdict(lambda: defaultdict(float))
+        for item in items:
+            for token in tokenize(item.name):
+                self.postings[token][item.id] += NAME_WEIGHT
+            for token in tokenize(item.description):
+                self.postings[token][item.id] += DESCRIPTION_WEIGHT
+        self.tokens = sorted(self.postings)
+
+    def search(self, terms, limit):
+        scores = None
+        for term in terms:
+            # Kata terakhir yang sedang diketik dan kata lain sama-sama dicocokkan sebagai awalan
+            start = bisect_left(self.tokens, term)
+            end = bisect_left(self.tokens, prefix_upper_bound(term))
+            term_scores = defaultdict(float)
+            for token in self.tokens[start:end]:
+                for service_id, weight in self.postings[token].items():
+                    term_scores[service_id] += weight
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {service_id: score + term_scores[service_id]
+                          for service_id, score in scores.items() if service_id in term_scores}
+        scores = scores or {}
+        return sorted(scores, key=lambda service_id: (-scores[service_id], service_id))[:limit]
+
+
+class ServiceSearch:
+    """
+    Pencarian full-text katalog layanan dengan hasil berperingkat dan prefix (type-ahead).
+    Backend dipilih per dialek: FTS5 di SQLite, tsvector + index GIN di Postgres
+    (butuh ekstensi unaccent), atau index Python dari snapshot katalog. Hasil selalu dipetakan ke snapshot
+    katalog, jadi hanya layanan aktif yang tampil dan tidak ada query tambahan.
+    """
+
+    def __init__(self):
+        self.configured_backend = 'auto'
+        self._backend = None
+        self._python_index = None
+        self._items = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.configured_backend = app.config['SEARCH_BACKEND']
+        self._backend = None
+        self._python_index = None
+        self._items = None
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = self._detect_backend()
+        return self._backend
+
+    def _detect_backend(self):
+        if self.configured_backend != 'auto':
+            return self.configured_backend
+        dialect = database.engine.dialect.name
+        if dialect == 'postgresql' and self._unaccent_installed():
+            return 'postgresql'
+        if dialect == 'sqlite' and self._fts_table_exists():
+            return 'fts5'
+        return 'python'
+
+    def _fts_table_exists(self):
+        return database.session.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+        ).first() is not None
+
+    def _unaccent_installed(self):
+        return database.session.execute(
+            text("SELECT to_regprocedure(:signature) IS NOT NULL"), {'signature': f'{UNACCENT_FUNCTION}(text)'}
+        ).scalar()
+
+    # --- Skema dan sinkronisasi ---
+
+    def install(self):
+        """Membuat tabel FTS5 / index GIN lalu mengisi ulang index (dipanggil dari migrasi bootstrap)."""
+        dialect = database.engine.dialect.name
+        if dialect == 'sqlite':
+            try:
+                database.session.execute(text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+                    # Index prefix 2-4 huruf untuk type-ahead
+                    "USING fts5(name, description, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4')"
+                ))
+            except OperationalError:
+                # SQLite dikompilasi tanpa FTS5: pakai index Python
+                database.session.rollback()
+                return
+        elif dialect == 'postgresql':
+            # Index lama (sebelum unaccent) memakai ekspresi yang berbeda dari query
+            database.session.execute(text("DROP INDEX IF EXISTS ix_laundry_services_search"))
+            if self._install_unaccent():
+                database.session.execute(text(
+                    f"CREATE INDEX ix_laundry_services_search ON laundry_services USING gin (({TSVECTOR_SQL}))"
+                ))
+            else:
+                current_app.logger.warning('Ekstensi unaccent tidak tersedia; pencarian layanan memakai index Python')
+        self._backend = None
+        self.rebuild()
+        database.session.commit()
+
+    def _install_unaccent(self):
+        """Ekstensi unaccent dan pembungkus IMMUTABLE-nya; False jika ekstensi tidak bisa dibuat."""
+        try:
+            with database.session.begin_nested():
+                database.session.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+                database.session.execute(text(
+                    f"CREATE OR REPLACE FUNCTION {UNACCENT_FUNCTION}(text) RETURNS text "
+                    "LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT "
+                    "AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$"
+                ))
+        except DatabaseError:
+            # Ekstensi tidak terpasang di server atau user database tidak berhak membuatnya
+            return False
+        return True
+
+    def rebuild(self):
+        """Mengisi ulang tabel FTS dari laundry_services dalam transaksi yang sedang berjalan."""
+        if self.backend != 'fts5':
+            return
+        database.session.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        database.session.execute(text(
+            f"INSERT INTO {FTS_TABLE} (rowid, name, description) SELECT id, name, description FROM laundry_services"
+        ))
+
+    def index_service(self, service):
+        """
+        Dipanggil sebelum commit create/edit layanan (id harus sudah ada, flush dulu untuk layanan baru).
+        Index GIN Postgres dan index Python mengikuti tabelnya sendiri.
+        """
+        if self.backend != 'fts5':
+            return
+        self.remove_service(service.id)
+        database.session.execute(
+            text(f"INSERT INTO {FTS_TABLE} (rowid, name, description) VALUES (:id, :name, :description)"),
+            {'id': service.id, 'name': service.name, 'description': service.description}
+        )
+
+    def remove_service(self, service_id):
+        if self.backend != 'fts5':
+            return
+        database.session.execute(text(f"DELETE FROM {FTS_TABLE} WHERE rowid = :id"), {'id': service_id})
+
+    # --- Pencarian ---
+
+    def search(self, query, limit=20):
+        """Layanan aktif yang cocok dengan semua kata (awalan), urut dari yang paling relevan."""
+        terms = tokenize(query)[:MAX_TERMS]
+        if not terms:
+            return []
+
+        snapshot = catalog_cache.snapshot()
+        if self.backend == 'fts5':
+            ids = self._search_fts5(terms, limit)
+        elif self.backend == 'postgresql':
+            ids = self._search_postgresql(terms, limit)
+        else:
+            ids = self._python_search_index(snapshot).search(terms, limit)
+
+        items = self._items_by_id(snapshot)
+        return [items[service_id] for service_id in ids if service_id in items]
+
+    def _search_fts5(self, terms, limit):
+        match = ' '.join(f'"{term}"*' for term in terms)
+        rows = database.session.execute(
+            text(
+                f"SELECT {FTS_TABLE}.rowid FROM {FTS_TABLE} "
+                f"JOIN laundry_services ON laundry_services.id = {FTS_TABLE}.rowid "
+                f"WHERE {FTS_TABLE} MATCH :match AND laundry_services.is_active "
+                f"ORDER BY bm25({FTS_TABLE}, {NAME_WEIGHT}, {DESCRIPTION_WEIGHT}), {FTS_TABLE}.rowid LIMIT :limit"
+            ),
+            {'match': match, 'limit': limit}
+        )
+        return [row[0] for row in rows]
+
+    def _search_postgresql(self, terms, limit):
+        tsquery = ' & '.join(f'{term}:*' for term in terms)
+        rows = database.session.execute(
+            text(
+                f"SELECT id FROM laundry_services "
+                f"WHERE is_active AND ({TSVECTOR_SQL}) @@ to_tsquery('simple', :tsquery) "
+                f"ORDER BY ts_rank(({TSVECTOR_SQL}), to_tsquery('simple', :tsquery)) DESC, id LIMIT :limit"
+            ),
+            {'tsquery': tsquery, 'limit': limit}
+        )
+        return [row[0] for row in rows]
+
+    def _python_search_index(self, snapshot):
+        # Dibangun ulang hanya saat versi katalog berubah
+        cached = self._python_index
+        if cached is None or cached[0] != snapshot.version:
+            with self._lock:
+                cached = self._python_index
+                if cached is None or cached[0] != snapshot.version:
+                    cached = (snapshot.version, PythonSearchIndex(snapshot.items))
+                    self._python_index = cached
+        return cached[1]
+
+    def _items_by_id(self, snapshot):
+        cached = self._items
+        if cached is None or cached[0] != snapshot.version:
+            cached = (snapshot.version, {item.id: item for item in snapshot.items})
+            self._items = cached
+        return cached[1]
+
+
+service_search = ServiceSearch()
@@ -0,0 +1,78 @@
+import logging
+import random
+import time
+from functools import wraps
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app.extensions import database
+
+logger = logging.getLogger(__name__)
+
+# Pesan error SQLite saat lock tulis tidak didapat dalam busy_timeout
+LOCK_ERROR_MESSAGES = ('database is locked', 'database table is locked', 'database schema is locked')
+
+
+def sqlite_pragmas(config):
+    """
+    PRAGMA per koneksi untuk banyak worker gunicorn pada satu file SQLite.
+    Nilai kosong berarti memakai default SQLite.
+    """
+    pragmas = [
+        # WAL: pembaca tidak memblokir penulis dan sebaliknya
+        ('journal_mode', config['SQLITE_JOURNAL_MODE']),
+        # Menunggu lock tulis (ms) alih-alih langsung gagal "database is locked"
+        ('busy_timeout', config['SQLITE_BUSY_TIMEOUT']),
+        # NORMAL aman untuk WAL (tidak korup), hanya commit terakhir yang bisa hilang saat listrik padam
+        ('synchronous', config['SQLITE_SYNCHRONOUS']),
+        ('cache_size', config['SQLITE_CACHE_SIZE']),
+        ('mmap_size', config['SQLITE_MMAP_SIZE']),
+    ]
+    return [(name, value) for name, value in pragmas if value not in (None, '')]
+
+
+def configure_sqlite(app):
+    """Memasang listener connect yang menerapkan PRAGMA ke setiap koneksi SQLite (primary dan replica)."""
+    pragmas = sqlite_pragmas(app.config)
+    if not pragmas:
+        return
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f'PRAGMA {name} = {value}')
+        finally:
+            cursor.close()
+
+    for engine in database.engines.values():
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', apply_pragmas)
+
+
+def is_lock_error(error):
+    return isinstance(error, OperationalError) and any(
+        message in str(error.orig).lower() for message in LOCK_ERROR_MESSAGES
+    )
+
+
+def retry_on_lock(function):
+    """
+    Menjalankan ulang route tulis jika transaksinya gagal karena database terkunci
+    (busy_timeout habis saat banyak worker menulis bersamaan). Transaksi di-rollback
+    dulu; route harus aman diulang, yaitu semua perubahan terjadi di satu commit.
+    """
+    @wraps(function)
+    def decorated_function(*args, **kwargs):
+        attempts = current_app.config['DATABASE_LOCK_RETRIES'] + 1
+        for attempt in range(1, attempts + 1):
+            try:
+                return function(*args, **kwargs)
+            except OperationalError as error:
+                if not is_lock_error(error) or attempt == attempts:
+                    raise
+                database.session.rollback()
+                delay = current_app.config['DATABASE_LOCK_RETRY_DELAY'] * 2 ** (attempt - 1)
+                logger.warning(f'{function.__name__}: database terkunci, percobaan ulang {attempt} dalam {delay:.2f}s')
+                time.sleep(delay * random.uniform(0.5, 1.5))
+    return decorated_function
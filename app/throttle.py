@@ -0,0 +1,157 @@
+import math
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from flask import current_app, request
+
+
+def parse_rate(value):
+    """
+    Mengubah string limit 'jumlah/detik' (mis. '20/60') menjadi (capacity, refill per detik).
+    """
+    count, seconds = value.split('/', 1)
+    capacity = int(count)
+    return capacity, capacity / float(seconds)
+
+
+class MemoryBucketStore:
+    """
+    Token bucket in-process.
+    Bucket dibagi ke beberapa shard dengan lock masing-masing agar thread jarang saling menunggu,
+    dan tiap shard dibatasi ukurannya (LRU) supaya banyak key palsu tidak menghabiskan memori.
+    """
+
+    def __init__(self, shards=16, max_keys_per_shard=4096):
+        self.max_keys_per_shard = max_keys_per_shard
+        self._shards = [(threading.Lock(), OrderedDict()) for _ in range(shards)]
+
+    def _shard(self, key):
+        return self._shards[zlib.crc32(key.encode()) % len(self._shards)]
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        """
+        Mengambil satu token. Mengembalikan 0 jika diizinkan,
+        atau jumlah detik sampai token berikutnya tersedia.
+        """
+        now = time.monotonic() if now is None else now
+        lock, buckets = self._shard(key)
+        with lock:
+            tokens, updated_at = buckets.pop(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0
+            else:
+                wait = (1 - tokens) / refill_rate
+
+            buckets[key] = (tokens, now)
+            if len(buckets) > self.max_keys_per_shard:
+                buckets.popitem(last=False)
+        return wait
+
+    def reset(self, key):
+        lock, buckets = self._shard(key)
+        with lock:
+            buckets.pop(key, None)
+
+
+class RedisBucketStore:
+    """
+    Token bucket bersama untuk semua worker/host, disimpan di Redis.
+    Package `redis` bersifat opsional dan hanya dibutuhkan jika backend ini dipakai.
+    """
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or capacity
+    local updated_at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+    local wait = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+    else
+        wait = (1 - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+    return tostring(wait)
+    """
+
+    def __init__(self, url, prefix='login-throttle:'):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('Package redis belum terinstall; jalankan `pip install redis`.')
+
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._consume = self._client.register_script(self.SCRIPT)
+
+    def consume(self, key, capacity, refill_rate, now=None):
+        now = time.time() if now is None else now
+        return float(self._consume(keys=[self.prefix + key], args=[capacity, refill_rate, now]))
+
+    def reset(self, key):
+        self._client.delete(self.prefix + key)
+
+
+class LoginThrottle:
+    """
+    Pembatas percobaan login per IP dan per username.
+    Dicek sebelum lookup database dan verifikasi password sehingga
+    serangan password spraying tidak bisa menghabiskan CPU worker.
+    """
+
+    def __init__(self, store=None):
+        self.enabled = True
+        self.store = store or MemoryBucketStore()
+        self.ip_limit = parse_rate('20/60')
+        self.username_limit = parse_rate('5/300')
+        self._forwarded_warned = False
+
+    def init_app(self, app):
+        self.enabled = app.config['LOGIN_THROTTLE_ENABLED']
+        self.ip_limit = parse_rate(app.config['LOGIN_THROTTLE_IP_LIMIT'])
+        self.username_limit = parse_rate(app.config['LOGIN_THROTTLE_USERNAME_LIMIT'])
+
+        redis_url = app.config.get('LOGIN_THROTTLE_REDIS_URL')
+        self.store = RedisBucketStore(redis_url) if redis_url else MemoryBucketStore()
+
+        self._forwarded_warned = False
+        if self.enabled and not app.config['PROXY_FIX_X_FOR']:
+            app.before_request(self._warn_ignored_forwarded_for)
+
+    def _warn_ignored_forwarded_for(self):
+        """Peringatan sekali per proses jika aplikasi di belakang proxy tapi IP client tidak dibaca."""
+        if self._forwarded_warned or 'X-Forwarded-For' not in request.headers:
+            return
+        self._forwarded_warned = True
+        current_app.logger.warning(
+            'X-Forwarded-For diabaikan karena PROXY_FIX_X_FOR=0: semua request terlihat dari IP proxy '
+            f'({request.remote_addr}), sehingga limit login per IP berlaku global. '
+            'Set PROXY_FIX_X_FOR ke jumlah reverse proxy di depan aplikasi.'
+        )
+
+    def hit(self, ip_address, username):
+        """
+        Mencatat satu percobaan login.
+        Mengembalikan 0 jika diizinkan, atau detik tunggu (dibulatkan ke atas) jika melewati limit.
+        """
+        if not self.enabled:
+            return 0
+
+        ip_wait = self.store.consume(f'ip:{ip_address}', *self.ip_limit)
+        username_wait = self.store.consume(f'user:{username.lower()}', *self.username_limit)
+        return math.ceil(max(ip_wait, username_wait))
+
+    def reset_username(self, username):
+        """Dipanggil setelah login berhasil agar user sah tidak ikut tertahan."""
+        if self.enabled:
+            self.store.reset(f'user:{username.lower()}')
+
+
+login_throttle = LoginThrottle()
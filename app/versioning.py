@@ -0,0 +1,75 @@
+import os
+import threading
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: bump tanpa lock file, cukup untuk development
+    fcntl = None
+
+
+class SharedVersion:
+    """
+    Nomor versi yang dibagi semua worker gunicorn di satu host.
+    Disimpan sebagai file kecil di folder instance; membaca versi hanya butuh os.stat()
+    dan isi file dibaca ulang hanya jika file berubah.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.path = None
+        self._lock = threading.Lock()
+        self._stat_key = None
+        self._value = 0
+
+    def init_app(self, app):
+        os.makedirs(app.instance_path, exist_ok=True)
+        self.path = os.path.join(app.instance_path, f'{self.name}.version')
+        self._stat_key = None
+        self._value = 0
+
+    def get(self):
+        """Versi saat ini (0 jika belum pernah di-bump)."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0
+
+        stat_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stat_key != self._stat_key:
+                self._value = self._read()
+                self._stat_key = stat_key
+            return self._value
+
+    def modified(self):
+        """Waktu (UTC, naive) bump terakhir di host ini, atau None jika belum pernah di-bump."""
+        try:
+            return datetime.utcfromtimestamp(os.stat(self.path).st_mtime)
+        except FileNotFoundError:
+            return None
+
+    def _read(self):
+        try:
+            with open(self.path) as version_file:
+                return int(version_file.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump(self):
+        """
+        Menaikkan versi secara atomik (lock file + os.replace) dan mengembalikan versi baru.
+        """
+        with open(f'{self.path}.lock', 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                value = self._read() + 1
+                temp_path = f'{self.path}.{os.getpid()}.tmp'
+                with open(temp_path, 'w') as version_file:
+                    version_file.write(str(value))
+                os.replace(temp_path, self.path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return value
@@ -0,0 +1,120 @@
+"""
+Benchmark latency dashboard admin
+Mengisi tabel service_orders bertahap (default 1rb sampai 1jt baris) di database SQLite sementara
+dan mengukur waktu dashboard_stats() pada setiap ukuran tabel.
+Dashboard membaca total berjalan per status (satu baris per status), jadi latency
+seharusnya datar terhadap jumlah pesanan maupun panjang riwayat harian.
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from config import Config
+from app import create_app
+from app.extensions import database
+from app.models.models.order import ServiceOrder
+from app.models.models.role import Role
+from app.models.models.service import LaundryService
+from app.models.models.user import User
+from app.query_budget import QueryCounter
+from app.reports import dashboard_stats
+from app.rollup import rebuild_rollup
+from app.seed import SERVICES_DATA
+
+STATUSES = ['pending', 'processing', 'ready', 'delivered', 'cancelled']
+BATCH_SIZE = 10000
+# Pesanan disebar dalam rentang tanggal tetap, seperti riwayat satu tahun operasional
+HISTORY_DAYS = 365
+
+
+def prepare_reference_data(customers=50):
+    """Role, customer, dan layanan minimal tanpa hashing password (agar cepat)."""
+    database.session.execute(insert(Role), [{'name': 'Karyawan'}, {'name': 'Customer'}])
+    customer_role = Role.query.filter_by(name='Customer').first()
+    database.session.execute(insert(User), [
+        {
+            'username': f'bench{i}',
+            'email': f'bench{i}@email.com',
+            'password': '-',
+            'full_name': f'Bench {i}',
+            'role_id': customer_role.id
+        }
+        for i in range(customers)
+    ])
+    database.session.execute(insert(LaundryService), SERVICES_DATA)
+    database.session.commit()
+
+    user_ids = [row[0] for row in database.session.query(User.id).all()]
+    services = [(row[0], row[1]) for row in database.session.query(LaundryService.id, LaundryService.price).all()]
+    return user_ids, services
+
+
+def grow_orders(target, user_ids, services, rng):
+    """Menambah baris service_orders hingga jumlahnya mencapai target."""
+    current = database.session.query(ServiceOrder.id).count()
+    started = datetime(2024, 1, 1)
+    while current < target:
+        batch = []
+        for number in range(current, min(target, current + BATCH_SIZE)):
+            service_id, price = rng.choice(services)
+            quantity = rng.randint(1, 10)
+            batch.append({
+                'order_number': f'BENCH-{number:08d}',
+                'quantity': quantity,
+                'total_price': price * quantity,
+                'status': rng.choice(STATUSES),
+                'order_date': started + timedelta(minutes=rng.randrange(HISTORY_DAYS * 24 * 60)),
+                'user_id': rng.choice(user_ids),
+                'service_id': service_id
+            })
+        database.session.execute(insert(ServiceOrder), batch)
+        database.session.commit()
+        current += len(batch)
+
+
+def measure(runs):
+    timings = []
+    with QueryCounter() as counter:
+        for _ in range(runs):
+            started = time.perf_counter()
+            dashboard_stats()
+            timings.append(time.perf_counter() - started)
+            database.session.rollback()
+    return statistics.median(timings), counter.count // runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', default='1000,10000,100000,1000000', help='Ukuran tabel service_orders, dipisah koma')
+    parser.add_argument('--runs', type=int, default=5, help='Jumlah pengukuran per ukuran (diambil median)')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+            SEED_ON_STARTUP = False
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            rng = random.Random(42)
+            user_ids, services = prepare_reference_data()
+
+            print("Benchmark dashboard_stats():")
+            print(f"   {'orders':>10} {'median':>10} {'query':>6}")
+            for size in sizes:
+                grow_orders(size, user_ids, services, rng)
+                rebuild_rollup()
+                elapsed, queries = measure(args.runs)
+                print(f"   {size:>10} {elapsed * 1000:8.2f} ms {queries:6d}")
+
+            database.engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Benchmark throughput pembuatan pesanan di SQLite dengan beberapa worker proses
+(seperti worker gunicorn) yang menulis ke file database yang sama.
+Membandingkan profil 'before' (rollback journal, tanpa PRAGMA, retry maupun timeout
+bawaan pysqlite 5 detik, sehingga kunci database langsung terlihat sebagai error) dengan
+profil 'after' (WAL, busy_timeout, synchronous=NORMAL, retry saat terkunci).
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from config import Config
+
+PROFILES = {
+    'before': {
+        'SQLITE_JOURNAL_MODE': 'DELETE',
+        'SQLITE_BUSY_TIMEOUT': '',
+        'SQLITE_SYNCHRONOUS': '',
+        'SQLITE_CACHE_SIZE': '',
+        'SQLITE_MMAP_SIZE': '',
+        'DATABASE_LOCK_RETRIES': 0,
+        # Tanpa timeout bawaan pysqlite (5 detik) yang diam-diam menunggu kunci dilepas
+        'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'timeout': 0}},
+    },
+    'after': {
+        'SQLITE_JOURNAL_MODE': Config.SQLITE_JOURNAL_MODE,
+        'SQLITE_BUSY_TIMEOUT': Config.SQLITE_BUSY_TIMEOUT,
+        'SQLITE_SYNCHRONOUS': Config.SQLITE_SYNCHRONOUS,
+        'SQLITE_CACHE_SIZE': Config.SQLITE_CACHE_SIZE,
+        'SQLITE_MMAP_SIZE': Config.SQLITE_MMAP_SIZE,
+        'DATABASE_LOCK_RETRIES': Config.DATABASE_LOCK_RETRIES,
+    },
+}
+
+# Customer dari seed data, login sekali per worker
+CUSTOMER_USERNAME = 'budi'
+CUSTOMER_PASSWORD = 'budi123'
+
+
+def make_config(database_path, profile):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{database_path}'
+        # Hash murah agar seed dan login tidak mendominasi benchmark
+        PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+        LOGIN_THROTTLE_ENABLED = False
+        OUTBOX_DISPATCHER = 'off'
+        PROPAGATE_EXCEPTIONS = False
+
+    for name, value in PROFILES[profile].items():
+        setattr(BenchConfig, name, value)
+    return BenchConfig
+
+
+def worker(database_path, profile, service_id, start_barrier, seconds, results):
+    logging.disable(logging.CRITICAL)
+    from app import create_app
+    app = create_app(make_config(database_path, profile))
+    client = app.test_client()
+    client.post('/auth/login', data={'username': CUSTOMER_USERNAME, 'password': CUSTOMER_PASSWORD})
+
+    form = {'quantity': 2, 'pickup_address': 'Jl. Benchmark 1', 'delivery_address': 'Jl. Benchmark 1'}
+    created = failed = 0
+    latencies = []
+    start_barrier.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = client.post(f'/order/{service_id}', data=form)
+        latencies.append(time.perf_counter() - started)
+        if response.status_code == 302:
+            created += 1
+        else:
+            failed += 1
+    results.put((created, failed, max(latencies, default=0.0)))
+
+
+def run(profile, workers, seconds, workdir):
+    database_path = os.path.join(workdir, f'{profile}-{workers}.db')
+    logging.disable(logging.CRITICAL)
+    from app import create_app
+    from app.extensions import database
+    from app.models.models.service import LaundryService
+    app = create_app(make_config(database_path, profile))
+    with app.app_context():
+        service_id = database.session.execute(database.select(LaundryService.id).limit(1)).scalar()
+        database.engine.dispose()
+
+    context = multiprocessing.get_context('spawn')
+    start_barrier = context.Barrier(workers)
+    results = context.Queue()
+    processes = [
+        context.Process(target=worker, args=(database_path, profile, service_id, start_barrier, seconds, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    totals = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    created = sum(result[0] for result in totals)
+    failed = sum(result[1] for result in totals)
+    max_latency = max(result[2] for result in totals)
+    return created / seconds, created, failed, max_latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='Jumlah worker proses')
+    parser.add_argument('--seconds', type=float, default=5, help='Durasi setiap putaran')
+    parser.add_argument('--profiles', nargs='+', default=['before', 'after'], choices=sorted(PROFILES))
+    args = parser.parse_args()
+
+    print(f'Benchmark pembuatan pesanan SQLite ({args.seconds:g} detik per putaran):')
+    print(f"   {'profil':<8} {'worker':>6} {'pesanan/s':>10} {'berhasil':>9} {'gagal':>6} {'max ms':>8}")
+    any_failed = False
+    with tempfile.TemporaryDirectory() as workdir:
+        for profile in args.profiles:
+            for workers in args.workers:
+                rate, created, failed, max_latency = run(profile, workers, args.seconds, workdir)
+                any_failed = any_failed or (profile == 'after' and failed > 0)
+                print(f'   {profile:<8} {workers:6d} {rate:10.1f} {created:9d} {failed:6d} {max_latency * 1000:8.1f}')
+
+    if any_failed:
+        print("Ada pesanan yang gagal dengan profil 'after' (database terkunci).")
+        return False
+    return True
+
+
+if __name__ == '__main__':
+    if not main():
+        sys.exit(1)
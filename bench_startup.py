@@ -0,0 +1,67 @@
+"""
+Benchmark waktu startup create_app()
+Mengukur wall time dan jumlah query SQL pada database kosong dan database yang sudah di-seed.
+Gunakan script ini untuk mendeteksi regresi waktu cold-start worker.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from config import Config
+from app import create_app
+from app.query_budget import QueryCounter
+
+
+def measure_startup(config_class):
+    """Menjalankan create_app() sekali dan mengembalikan (detik, jumlah query)."""
+    with QueryCounter() as counter:
+        started = time.perf_counter()
+        app = create_app(config_class)
+        elapsed = time.perf_counter() - started
+
+    with app.app_context():
+        from app.extensions import database
+        database.engine.dispose()
+    return elapsed, counter.count
+
+
+def run_benchmark(seed_on_startup=True):
+    with tempfile.TemporaryDirectory() as workdir:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+            SEED_ON_STARTUP = seed_on_startup
+            DATABASE_BOOTSTRAP = 'auto'
+
+        empty = measure_startup(BenchConfig)
+        seeded = measure_startup(BenchConfig)
+
+    return {'empty': empty, 'seeded': seeded}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--no-seed', action='store_true', help='Ukur bootstrap tanpa seeding (tanpa hashing password)')
+    parser.add_argument('--max-seconds', type=float, default=0.5, help='Batas waktu startup pada DB yang sudah di-seed')
+    parser.add_argument('--max-queries', type=int, default=1, help='Batas jumlah query startup pada DB yang sudah di-seed')
+    args = parser.parse_args()
+
+    results = run_benchmark(seed_on_startup=not args.no_seed)
+
+    print("Benchmark startup create_app():")
+    for label, (elapsed, queries) in results.items():
+        print(f"   {label:<8} {elapsed * 1000:10.1f} ms {queries:6d} query")
+
+    elapsed, queries = results['seeded']
+    if elapsed > args.max_seconds or queries > args.max_queries:
+        print(f"Regresi startup: batas {args.max_seconds * 1000:.0f} ms / {args.max_queries} query")
+        return False
+
+    print("Startup pada DB yang sudah di-seed masih dalam batas.")
+    return True
+
+
+if __name__ == "__main__":
+    if not main():
+        sys.exit(1)
@@ -0,0 +1,95 @@
+"""
+Cek budget query route streaming
+Menjalankan route export (CSV/NDJSON) dengan QUERY_BUDGET_MODE=raise di database SQLite
+sementara dan memastikan query di dalam generator respons ikut dihitung: route export
+harus tetap di dalam budget-nya, sedangkan route streaming yang melebihi budget harus gagal.
+"""
+
+import os
+import sys
+import tempfile
+from flask import Response, stream_with_context
+from config import Config
+from app import create_app
+from app.extensions import database
+from app.models.models.order import ServiceOrder
+from app.models.models.service import LaundryService
+from app.models.models.user import User
+from app.query_budget import QueryBudgetExceeded, query_budget, stream_within_budget
+
+EXPORT_URLS = (
+    '/admin/orders/export?format=csv',
+    '/admin/orders/export?format=ndjson',
+    '/admin/customers/export?format=csv',
+)
+
+
+def add_orders(count=5):
+    """Beberapa pesanan agar export terbaca dalam lebih dari satu batch (EXPORT_BATCH_SIZE)."""
+    customer = User.query.filter_by(username='budi').first()
+    service = LaundryService.query.first()
+    for number in range(count):
+        database.session.add(ServiceOrder(
+            order_number=f'CHECK-{number:04d}', quantity=1, total_price=service.price,
+            user_id=customer.id, service_id=service.id
+        ))
+    database.session.commit()
+
+
+def add_over_budget_route(app):
+    """Route streaming dengan budget 1 yang menjalankan satu query per potongan."""
+    @query_budget(1)
+    def over_budget_stream():
+        def chunks():
+            for _ in range(3):
+                yield f'{LaundryService.query.count()}\n'
+        return Response(stream_with_context(stream_within_budget(chunks())))
+
+    app.add_url_rule('/check/over-budget', view_func=over_budget_stream)
+
+
+def fetch(client, url):
+    """(status, jumlah byte, pesan QueryBudgetExceeded atau None) setelah seluruh stream dibaca."""
+    try:
+        response = client.get(url)
+        return response.status_code, len(response.data), None
+    except QueryBudgetExceeded as e:
+        return None, 0, str(e)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        class CheckConfig(Config):
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'check.db')}"
+            SEED_ON_STARTUP = True
+            QUERY_BUDGET_MODE = 'raise'
+            EXPORT_BATCH_SIZE = 2
+
+        app = create_app(CheckConfig)
+        with app.app_context():
+            add_orders()
+        add_over_budget_route(app)
+        client = app.test_client()
+        client.post('/auth/login', data={'username': 'karyawan', 'password': 'karyawan123'})
+
+        failures = 0
+        print("Cek budget query route streaming (QUERY_BUDGET_MODE=raise):")
+        for url in EXPORT_URLS:
+            status, size, error = fetch(client, url)
+            ok = status == 200 and error is None
+            failures += not ok
+            print(f"   {'OK' if ok else 'GAGAL':5} {url} -> {error or f'{status}, {size} byte'}")
+
+        status, _, error = fetch(client, '/check/over-budget')
+        ok = error is not None
+        failures += not ok
+        print(f"   {'OK' if ok else 'GAGAL':5} /check/over-budget -> {error or f'{status} tanpa QueryBudgetExceeded'}")
+
+        with app.app_context():
+            database.engine.dispose()
+
+    return failures == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
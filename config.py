@@ -21,4 +21,122 @@ class Config:
     PERMANENT_SESSION_LIFETIME = timedelta(hours=2)
     SESSION_COOKIE_SECURE = os.environ.get('FLASK_ENV') == 'production'  # True untuk HTTPS
     SESSION_COOKIE_HTTPONLY = True
-    SESSION_COOKIE_SAMESITE = 'Lax'
\ No newline at end of file
+    SESSION_COOKIE_SAMESITE = 'Lax'
+
+    # Hashing password: method/work factor per environment, jumlah thread dan panjang antrian.
+    # Hash lama dengan cost berbeda otomatis diperbarui saat user berhasil login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 8))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))
+
+    # Throttle login: format 'jumlah/detik'. Isi LOGIN_THROTTLE_REDIS_URL untuk berbagi limit antar worker.
+    LOGIN_THROTTLE_ENABLED = os.environ.get('LOGIN_THROTTLE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    LOGIN_THROTTLE_IP_LIMIT = os.environ.get('LOGIN_THROTTLE_IP_LIMIT', '20/60')
+    LOGIN_THROTTLE_USERNAME_LIMIT = os.environ.get('LOGIN_THROTTLE_USERNAME_LIMIT', '5/300')
+    LOGIN_THROTTLE_REDIS_URL = os.environ.get('LOGIN_THROTTLE_REDIS_URL')
+
+    # Jumlah reverse proxy di depan aplikasi agar IP client terbaca benar dari X-Forwarded-For.
+    # Dengan 0 di belakang proxy, semua request terlihat dari IP proxy sehingga limit login per IP
+    # menjadi satu limit global. Default 1 di Railway (RAILWAY_ENVIRONMENT diisi otomatis oleh
+    # Railway), selain itu 0; jangan lebih besar dari jumlah proxy asli agar header tidak bisa dipalsukan.
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 1 if os.environ.get('RAILWAY_ENVIRONMENT') else 0))
+
+    # Cache hasil render halaman publik (/, /services, /about, /contact) untuk pengunjung anonim
+    PAGE_CACHE_ENABLED = os.environ.get('PAGE_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+
+    # Slot worker (0-63) untuk nomor pesanan; default diambil dari PID proses
+    ORDER_WORKER_ID = int(os.environ['ORDER_WORKER_ID']) if os.environ.get('ORDER_WORKER_ID') else None
+
+    # Ukuran halaman daftar pesanan (keyset pagination); ?per_page= dibatasi PAGE_SIZE_MAX
+    ORDERS_PAGE_SIZE = int(os.environ.get('ORDERS_PAGE_SIZE', 50))
+    CUSTOMERS_PAGE_SIZE = int(os.environ.get('CUSTOMERS_PAGE_SIZE', 50))
+    PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX', 200))
+
+    # Instrumentasi jumlah query per request: 'off', 'warn' (log) atau 'raise' (untuk tes/benchmark)
+    QUERY_BUDGET_MODE = os.environ.get('QUERY_BUDGET_MODE', 'off').lower()
+
+    # Jumlah baris per batch server-side cursor saat export CSV/NDJSON
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+    # Feed live pesanan (server-sent events): interval polling relay per worker (detik),
+    # heartbeat, batas koneksi per worker, umur maksimum satu stream sebelum browser reconnect.
+    # Tanpa SSE_MAX_CLIENTS batasnya tiga perempat kapasitas worker (GUNICORN_WORKER_CONNECTIONS
+    # untuk gevent, GUNICORN_THREADS untuk gthread); sisanya selalu untuk request biasa.
+    SSE_POLL_INTERVAL = float(os.environ.get('SSE_POLL_INTERVAL', 1.0))
+    SSE_HEARTBEAT_SECONDS = int(os.environ.get('SSE_HEARTBEAT_SECONDS', 15))
+    SSE_MAX_CLIENTS = int(os.environ['SSE_MAX_CLIENTS']) if os.environ.get('SSE_MAX_CLIENTS') else None
+    SSE_STREAM_SECONDS = int(os.environ.get('SSE_STREAM_SECONDS', 300))
+    SSE_QUEUE_SIZE = int(os.environ.get('SSE_QUEUE_SIZE', 100))
+    ORDER_EVENTS_RETENTION_SECONDS = int(os.environ.get('ORDER_EVENTS_RETENTION_SECONDS', 3600))
+    # Berapa lama relay menunggu id event yang terlewati (transaksi yang commit belakangan)
+    ORDER_EVENTS_LOOKBACK_SECONDS = float(os.environ.get('ORDER_EVENTS_LOOKBACK_SECONDS', 30))
+
+    # Backend pencarian layanan: 'auto' (FTS5 di SQLite, tsvector di Postgres) atau 'python'
+    SEARCH_BACKEND = os.environ.get('SEARCH_BACKEND', 'auto').lower()
+
+    # Outbox efek samping pesanan: 'thread' (dispatcher di setiap worker web) atau 'off'
+    # (hanya `flask outbox run` sebagai proses terpisah)
+    OUTBOX_DISPATCHER = os.environ.get('OUTBOX_DISPATCHER', 'thread').lower()
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE', 50))
+    OUTBOX_WORKERS = int(os.environ.get('OUTBOX_WORKERS', 4))
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL', 5))
+    OUTBOX_LEASE_SECONDS = int(os.environ.get('OUTBOX_LEASE_SECONDS', 60))
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS', 10))
+    OUTBOX_BACKOFF_BASE = float(os.environ.get('OUTBOX_BACKOFF_BASE', 2))
+    OUTBOX_BACKOFF_MAX = float(os.environ.get('OUTBOX_BACKOFF_MAX', 3600))
+    OUTBOX_RETENTION_DAYS = int(os.environ.get('OUTBOX_RETENTION_DAYS', 7))
+    OUTBOX_WEBHOOK_URL = os.environ.get('OUTBOX_WEBHOOK_URL')
+    OUTBOX_WEBHOOK_TIMEOUT = float(os.environ.get('OUTBOX_WEBHOOK_TIMEOUT', 5))
+
+    # Worker gunicorn, dibaca juga oleh gunicorn.conf.py. 'gevent' (default untuk Postgres/MySQL):
+    # setiap request dan stream feed live hanya satu greenlet, jadi browser yang menunggu event
+    # tidak menahan thread. 'gthread' (default untuk SQLite, karena menunggu lock SQLite
+    # memblokir seluruh worker gevent): satu thread per request atau stream.
+    WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 2))
+    GUNICORN_WORKER_CLASS = os.environ.get('GUNICORN_WORKER_CLASS') or (
+        'gthread' if SQLALCHEMY_DATABASE_URI.startswith('sqlite') else 'gevent'
+    )
+    GUNICORN_WORKER_CONNECTIONS = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))
+    GUNICORN_THREADS = int(os.environ.get('GUNICORN_THREADS', 16))
+
+    # Pool koneksi database. Ukuran default GUNICORN_THREADS koneksi per worker (gthread: satu
+    # per thread; gevent: jumlah request yang memakai database bersamaan, sisanya menunggu
+    # checkout) + overflow untuk thread latar. Stream feed live tidak memegang koneksi. Isi
+    # DATABASE_MAX_CONNECTIONS (mis. max_connections Postgres dikurangi cadangan) agar total
+    # koneksi semua worker tidak melewatinya. Recycle/pre-ping mencegah error koneksi basi
+    # setelah idle (proxy Railway memutus koneksi yang lama menganggur).
+    DATABASE_POOL_SIZE = int(os.environ['DATABASE_POOL_SIZE']) if os.environ.get('DATABASE_POOL_SIZE') else None
+    DATABASE_MAX_OVERFLOW = int(os.environ['DATABASE_MAX_OVERFLOW']) if os.environ.get('DATABASE_MAX_OVERFLOW') else None
+    DATABASE_MAX_CONNECTIONS = int(os.environ['DATABASE_MAX_CONNECTIONS']) if os.environ.get('DATABASE_MAX_CONNECTIONS') else None
+    DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 10))
+    DATABASE_POOL_RECYCLE = int(os.environ.get('DATABASE_POOL_RECYCLE', 1800))
+    DATABASE_POOL_PRE_PING = os.environ.get('DATABASE_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+
+    # Profil SQLite untuk beberapa worker gunicorn pada satu file database (diabaikan di Postgres/MySQL).
+    # Kosongkan nilai untuk memakai default SQLite. cache_size negatif = KiB per koneksi.
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'WAL')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -8000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 128 * 1024 * 1024))
+
+    # Route tulis diulang jika database terkunci (detik, digandakan setiap percobaan)
+    DATABASE_LOCK_RETRIES = int(os.environ.get('DATABASE_LOCK_RETRIES', 3))
+    DATABASE_LOCK_RETRY_DELAY = float(os.environ.get('DATABASE_LOCK_RETRY_DELAY', 0.05))
+
+    # Read replica opsional (nonaktif jika kosong): SELECT di route baca berat dilayani replica.
+    # Setelah menulis, browser yang sama membaca dari primary selama sticky seconds.
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    READ_REPLICA_STICKY_SECONDS = int(os.environ.get('READ_REPLICA_STICKY_SECONDS', 10))
+
+    # Cache identitas current_user per proses (detik, jumlah entri). TTL 0 = nonaktif.
+    IDENTITY_CACHE_TTL = int(os.environ.get('IDENTITY_CACHE_TTL', 60))
+    IDENTITY_CACHE_SIZE = int(os.environ.get('IDENTITY_CACHE_SIZE', 1024))
+
+    # Seeding otomatis saat startup jika database masih kosong.
+    # Set SEED_ON_STARTUP=false dan jalankan `flask seed` secara manual saat deploy.
+    SEED_ON_STARTUP = os.environ.get('SEED_ON_STARTUP', 'true').lower() in ('1', 'true', 'yes')
+
+    # Bootstrap skema saat startup: 'auto' (dijaga lock lintas worker) atau 'off'
+    DATABASE_BOOTSTRAP = os.environ.get('DATABASE_BOOTSTRAP', 'auto').lower()
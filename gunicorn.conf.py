@@ -0,0 +1,25 @@
+import os
+from config import Config
+
+# Dibaca otomatis oleh `gunicorn run:app` (Procfile dan railway.json).
+# Jenis worker dan ukurannya diambil dari Config agar sama dengan yang dipakai aplikasi
+# (batas koneksi feed live, ukuran pool database).
+# gevent: koneksi feed live (SSE) yang menganggur hanya satu greenlet yang menunggu event,
+# sehingga ratusan browser karyawan tidak menahan thread maupun worker.
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = Config.WEB_CONCURRENCY
+worker_class = Config.GUNICORN_WORKER_CLASS
+worker_connections = Config.GUNICORN_WORKER_CONNECTIONS
+threads = Config.GUNICORN_THREADS
+
+# Request biasa dibatasi timeout; stream SSE tetap hidup karena worker gevent/gthread tidak
+# memakai timeout per request dan stream ditutup sendiri setelah SSE_STREAM_SECONDS
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+keepalive = 5
+
+
+def post_fork(server, worker):
+    if worker_class == 'gevent':
+        # psycopg2 memakai socket di C: tanpa wait callback ini query Postgres memblokir seluruh worker
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()